@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import Optional
 from fastapi import FastAPI, Request, Depends, Query, HTTPException
@@ -8,6 +9,9 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.database import get_db, Base, engine
+from app.utils.http_client import close_http_session
+from app.services.tokenizer import shutdown_tokenizer
+from app.services.place_sync_job import start_place_sync_scheduler
 from app.routers import (
     auth, user, oauth_google, oauth_kakao, oauth_naver,
     region_router, weather_router, calendar_router, follow, places, address_router,
@@ -33,6 +37,16 @@ app.add_middleware(
 
 Base.metadata.create_all(bind=engine)
 
+@app.on_event("startup")
+async def start_background_jobs():
+    if os.getenv("PLACE_SYNC_ENABLED", "1") == "1":
+        start_place_sync_scheduler()
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    await close_http_session()
+    shutdown_tokenizer()
+
 # 모든 라우터 등록 (중복 제거)
 app.include_router(places.router, prefix="/places", tags=["places"])
 app.include_router(hashtag.router)
@@ -62,10 +76,11 @@ async def log_headers(request: Request, call_next):
 
 # 메인 페이지
 @app.get("/", response_class=HTMLResponse)
-async def main_page(request: Request, db: Session = Depends(get_db)):
+async def main_page(request: Request, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     from app.services import places as places_service
-    
-    try:
+    from app.services.page_cache import cached_page
+
+    def render() -> str:
         ctx = places_service.build_places_context(
             request=request,
             db=db,
@@ -76,8 +91,15 @@ async def main_page(request: Request, db: Session = Depends(get_db)):
             search=None,
             tag=None,
             current_user=None,
+            cursor=cursor,
         )
-        return templates.TemplateResponse("places_list.html", {"request": request, **ctx})
+        return templates.get_template("places_list.html").render({"request": request, **ctx})
+
+    try:
+        # 모든 방문자에게 같은 화면 → 렌더링 결과 캐시
+        return await cached_page(request, {"cursor": cursor} if cursor else {}, render)
+    except places_service.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         print("🔥 / main_page error:", e)
@@ -1,5 +1,5 @@
 # app/models/hashtag.py
-from sqlalchemy import Column, BigInteger, String, ForeignKey, TIMESTAMP, func
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, TIMESTAMP, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -25,3 +25,16 @@ class PlaceTag(Base):
     place = relationship("Place", back_populates="hashtags")
     tag = relationship("Tag", back_populates="places")
 
+
+
+class TagStat(Base):
+    """
+    태그별 장소 수 (자동완성/인기 태그용, 주기적으로 다시 계산)
+    """
+    __tablename__ = "tag_stats"
+
+    tag_id = Column(BigInteger, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    slug = Column(String(100), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    place_count = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(TIMESTAMP, server_default=func.now())
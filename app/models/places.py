@@ -1,7 +1,7 @@
 from sqlalchemy import (
     Column, BigInteger, String, Text, Integer, DECIMAL, Boolean, 
-    JSON, TIMESTAMP, Date, Float, DateTime, ForeignKey)
-from sqlalchemy.orm import relationship
+    JSON, TIMESTAMP, Date, Float, DateTime, ForeignKey, Index)
+from sqlalchemy.orm import query_expression, relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -13,6 +13,18 @@ class Place(Base):
     (TourAPI detailCommon 기반)
     """
     __tablename__ = "places"
+    __table_args__ = (
+        # 지도 영역(bounding box) 조회용
+        Index("ix_places_mapy_mapx", "mapy", "mapx"),
+        # 제목/개요 전문 검색 (한국어 → ngram parser)
+        Index("ft_places_title_overview", "title", "overview", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        Index("ft_places_title", "title", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        # 목록 정렬(이미지 있는 것 먼저) + keyset 페이지네이션용
+        Index("ix_places_list_updated", "has_image", "updated_at", "id"),
+        Index("ix_places_list_id", "has_image", "id"),
+        # 내보내기 증분 조회(If-Modified-Since) / Last-Modified 용
+        Index("ix_places_synced_at", "synced_at"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True) # 내부 pk
     contentid = Column(String(50), unique=True, nullable=False)  # TourAPI contentid
@@ -39,6 +51,11 @@ class Place(Base):
     overview = Column(Text)
     firstimage = Column(String(500))
     firstimage2 = Column(String(500))
+    has_image = Column(Boolean, nullable=False, default=False, server_default="0")  # firstimage 유무 (목록 정렬용)
+    # 목록 카드용 개요 첫 문장 (조회 시 with_expression으로 채움, overview 전체는 읽지 않음)
+    overview_summary = query_expression()
+    # 해시태그를 만든 시점의 입력(관광타입/개요/주소) 지문 - 바뀐 장소만 재생성
+    tag_fingerprint = Column(String(40))
     
     # 기타정보
     homepage = Column(Text)
@@ -49,6 +66,8 @@ class Place(Base):
 
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    # 이 서버에서 행 내용이 마지막으로 바뀐 시각 (UTC) - updated_at은 증분 동기화 시 TourAPI modifiedtime
+    synced_at = Column(DateTime)
 
     # Relationships
     details = relationship("PlaceDetail", back_populates="place", uselist=False)
@@ -59,6 +78,10 @@ class Place(Base):
     
 
 
+# "created" 정렬은 has_image DESC, created_at ASC 방향이 섞여 있어 인덱스도 같은 방향으로 (MySQL 8 내림차순 인덱스)
+Index("ix_places_list_created", Place.has_image.desc(), Place.created_at, Place.id)
+
+
 #
 class PlaceDetail(Base):
     """
@@ -67,6 +90,11 @@ class PlaceDetail(Base):
     """
     __tablename__ = "place_details"
 
+    __table_args__ = (
+        # 장소당 1행 (이미지/소개 저장이 동시에 일어나도 같은 행을 upsert)
+        Index("uq_place_details_place_id", "place_id", unique=True),
+    )
+
     id = Column(BigInteger, primary_key=True, index=True)
     place_id = Column(BigInteger, ForeignKey("places.id"), nullable=False)
 
@@ -106,4 +134,34 @@ class Festival(Base):
     playtime = Column(String(200))
     agelimit = Column(String(100))
 
-    place = relationship("Place", back_populates="festival")
\ No newline at end of file
+    place = relationship("Place", back_populates="festival")
+
+
+class PlaceSyncState(Base):
+    """
+    TourAPI 증분 동기화 상태
+    관광타입(contenttypeid)별 마지막으로 반영한 modifiedtime(high-water mark)
+    """
+    __tablename__ = "place_sync_state"
+
+    contenttypeid = Column(Integer, primary_key=True, autoincrement=False)
+    last_modifiedtime = Column(String(14))  # YYYYMMDDhhmmss
+    synced_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class PlaceFeature(Base):
+    """
+    추천 점수 계산용 장소 특징 (지역/활동/동행자 키워드를 비트마스크로 저장)
+    장소 수집/해시태그 생성 후 다시 계산
+    """
+    __tablename__ = "place_features"
+
+    place_id = Column(BigInteger, ForeignKey("places.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    contentid = Column(String(50), nullable=False)
+    contenttypeid = Column(Integer, nullable=False)
+    areacode = Column(String(10))
+    region = Column(String(10))  # addr1 앞 2글자 (목록 지역 필터와 같은 기준)
+    tag_mask = Column(Integer, nullable=False, default=0)
+    area_mask = Column(Integer, nullable=False, default=0)
+    activity_mask = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,33 +1,75 @@
 # app/routers/hashtag.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.services.hashtag import (
     generate_hashtags_fast,
     search_places_by_hashtag,
-    generate_hashtags_for_all_saved_places_service,
-    load_all_tags
 )
+from app.services.tag_suggest import suggest_tags
+from app.services.hashtag_engine import (
+    get_hashtag_job_progress,
+    is_hashtag_job_running,
+    run_hashtag_job,
+    try_acquire_hashtag_job,
+)
+from app.services.page_cache import invalidate_hashtag_pages
 
 router = APIRouter(prefix="/hashtags", tags=["Hashtags"])
 
 # 특정 Place에 해시태그 생성
 @router.post("/generate/{place_id}")
 def generate_place_hashtags(place_id: int, db: Session = Depends(get_db)):
-    tag_cache = load_all_tags(db)
-    hashtags = generate_hashtags_fast(db, place_id, tag_cache)
-    db.commit()  # PlaceTag, Tag 모두 commit
+    hashtags = generate_hashtags_fast(db, place_id)  # Tag, PlaceTag, 지문 저장 후 commit
+    invalidate_hashtag_pages()
     return {"place_id": place_id, "hashtags": hashtags}
 
 
+# 해시태그 자동완성 / 인기 태그 (q가 없으면 인기순)
+@router.get("/suggest")
+def suggest_hashtags(
+    q: str = Query("", description="입력 중인 해시태그 앞부분"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    return {"q": q, "tags": suggest_tags(db, q, limit)}
+
+
 # 해시태그 검색 → 관련 관광지 조회
 @router.get("/search")
-def search_by_hashtag(tag: str = Query(..., description="검색할 해시태그"), db: Session = Depends(get_db)):
-    places = search_places_by_hashtag(db, tag)
-    return {"hashtag": tag, "places": [{"id": p.id, "title": p.title} for p in places]}
+def search_by_hashtag(
+    tag: str = Query(..., description="검색할 해시태그 (쉼표로 여러 개)"),
+    mode: str = Query("and", pattern="^(and|or)$"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    result = search_places_by_hashtag(db, tag, mode=mode, page=page, per_page=per_page)
+    return {
+        "hashtag": tag,
+        "total": result["total"],
+        "page": page,
+        "places": [
+            {"id": p.id, "contentid": p.contentid, "title": p.title, "addr1": p.addr1, "firstimage": p.firstimage}
+            for p in result["places"]
+        ],
+    }
 
 
-# DB 저장 관광지 기준 해시태그 일괄 생성
+# DB 저장 관광지 기준 해시태그 일괄 생성 (백그라운드 작업)
 @router.post("/places/fetch/all", summary="DB 저장 관광지 기준 해시태그 생성")
-def generate_hashtags_for_all_saved_places(db: Session = Depends(get_db)):
-    return generate_hashtags_for_all_saved_places_service(db)
\ No newline at end of file
+def generate_hashtags_for_all_saved_places(
+    background_tasks: BackgroundTasks,
+    mode: str = Query("changed", pattern="^(changed|queued|full)$", description="changed: 바뀐 장소만 / queued: 수집 대기열만 / full: 전체"),
+):
+    if not try_acquire_hashtag_job():
+        return {"message": "해시태그 생성 작업이 이미 진행 중입니다", "status_url": "/hashtags/jobs/status"}
+
+    background_tasks.add_task(run_hashtag_job, mode=mode)
+    return {"message": "해시태그 생성 작업을 시작했습니다", "status_url": "/hashtags/jobs/status"}
+
+
+# 해시태그 일괄 생성 진행 상황
+@router.get("/jobs/status")
+def hashtag_job_status():
+    return {"running": is_hashtag_job_running(), "progress": get_hashtag_job_progress()}
\ No newline at end of file
@@ -1,31 +1,62 @@
-from fastapi import APIRouter, Depends, Request, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import os
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi.responses import HTMLResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response, HTTPException
+from sqlalchemy.orm import Session, selectinload
 from app.database import get_db
 from app.services.places import (
-    save_places_to_db,
+    PLACES_CATALOG_VERSION,
     get_place_detail,
-    get_all_places,
-    fetch_detail_images,
-    fetch_detail_info,
-    build_places_context
+    build_places_context,
+    InvalidCursor,
+    PlaceListPlan,
+    run_place_list,
+)
+from app.services.place_detail_cache import (
+    get_detail_images_cached,
+    get_detail_info_cached,
+)
+from app.services.spatial_index import find_nearby_places
+from app.services.place_search import search_places
+from app.services.map_tiles import (
+    MIN_ZOOM,
+    MAX_ZOOM,
+    TILE_CACHE_TTL,
+    build_tile,
+    search_map_points,
+)
+from app.utils.redis_client import get_cached, set_cached, get_version
+from app.services.place_ingest_service import (
+    run_place_ingestion,
+    run_place_delta_sync,
+    get_ingest_progress,
+    get_sync_progress,
+    is_ingestion_running,
+)
+from app.services.page_cache import cached_page
+from app.services.place_export import (
+    EXPORT_MAX_LIMIT,
+    get_catalog_last_modified,
+    iter_place_export,
+    parse_export_fields,
 )
-from app.schemas.places import PlaceResponse
 from typing import List
-from app.models.places import Place, PlaceDetail
+from app.models.places import Place
 from app.models.user import User
 from app.models.user_profile import UserProfile
-from app.models.hashtag import PlaceTag, Tag 
+from app.models.hashtag import PlaceTag
 from fastapi.templating import Jinja2Templates
 import math
 from app.utils.auth import get_current_user_optional, get_current_user
 from app.services.recommendation_service import (
-    sort_places_with_preferences,
+    get_recommendations,
     get_place_scores_for_user,
-    USER_TOP_RECOMMENDED,
+    recommend_params,
     TOP_N,
 )
-from sqlalchemy import case, exists, func  
-from sqlalchemy import or_, and_
 from typing import Optional
 
 
@@ -36,30 +67,167 @@ templates = Jinja2Templates(directory="frontend/templates")
 
 #DB 저장
 @router.post("/fetch")
-def fetch_and_save_places(db: Session = Depends(get_db)):
+async def fetch_and_save_places(background_tasks: BackgroundTasks, resume: bool = True):
     '''
-    #TourAPI 데이터를 가져와 DB에 저장
+    #TourAPI 데이터를 백그라운드에서 병렬 수집해 DB에 저장
+    #진행 상황은 /places/fetch/status 에서 확인
     '''
-    save_places_to_db(db)
-    return {"message": "TourAPI data saved successfully"}
+    if await is_ingestion_running():
+        return {"message": "TourAPI 수집 작업이 이미 진행 중입니다", "status_url": "/places/fetch/status"}
 
-#목록 조회
-@router.get("/", response_model=list[PlaceResponse])
-def read_places(db: Session = Depends(get_db)):
+    background_tasks.add_task(run_place_ingestion, resume=resume)
+    return {"message": "TourAPI 수집 작업을 시작했습니다", "status_url": "/places/fetch/status"}
+
+@router.get("/fetch/status")
+async def fetch_status():
     '''
-    #저장된 관광지 목록 조회(JSON)
+    #TourAPI 수집 진행 상황 조회
     '''
-    #return get_all_places(db)
-    per_page = 10000  # 모든 데이터 가져오기
-    return db.query(Place).order_by(Place.id.desc()).limit(per_page).all()
+    progress = await get_ingest_progress()
+    return {"running": await is_ingestion_running(), "progress": progress}
+
+@router.post("/sync")
+async def sync_changed_places(background_tasks: BackgroundTasks):
+    '''
+    #TourAPI 변경분(modifiedtime 기준)만 백그라운드에서 동기화
+    #평소에는 스케줄러가 주기적으로 실행
+    '''
+    if await is_ingestion_running():
+        return {"message": "TourAPI 수집/동기화 작업이 이미 진행 중입니다", "status_url": "/places/sync/status"}
+
+    background_tasks.add_task(run_place_delta_sync)
+    return {"message": "TourAPI 증분 동기화를 시작했습니다", "status_url": "/places/sync/status"}
+
+@router.get("/sync/status")
+async def sync_status():
+    '''
+    #마지막 증분 동기화 결과 조회
+    '''
+    return {"running": await is_ingestion_running(), "progress": await get_sync_progress()}
+
+#목록 조회 (스트리밍 내보내기)
+@router.get("/")
+def read_places(
+    request: Request,
+    fields: str | None = Query(None, description="쉼표로 구분한 컬럼 (기본: id,contentid,title,addr1,overview)"),
+    after_id: int = Query(0, ge=0, description="이전 응답 마지막 항목의 id"),
+    limit: int = Query(1000, ge=1, le=EXPORT_MAX_LIMIT),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    '''
+    #저장된 관광지 목록 조회(JSON 배열 / NDJSON 스트리밍)
+    - id 오름차순, after_id 이후 limit건
+    - If-Modified-Since 이후 변경분만 (변경 없으면 304)
+    '''
+    try:
+        selected = parse_export_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # synced_at은 UTC 기준 naive datetime (서버에서 행이 바뀐 시각)
+    last_modified = get_catalog_last_modified()
+    headers = {}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    synced_since = None
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            synced_since = parsedate_to_datetime(if_modified_since).astimezone(timezone.utc).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            synced_since = None
+        if synced_since is not None and (last_modified is None or last_modified.replace(microsecond=0) <= synced_since):
+            return Response(status_code=304, headers=headers)
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(
+        iter_place_export(selected, after_id=after_id, synced_since=synced_since, limit=limit, fmt=format),
+        media_type=media_type,
+        headers=headers,
+    )
 
 
 
 
     
+# 상세 페이지에서 TourAPI 응답을 기다리는 최대 시간 (초과 시 해당 영역 없이 렌더링)
+DETAIL_RENDER_TIMEOUT = float(os.getenv("PLACE_DETAIL_RENDER_TIMEOUT", "1.5"))
+# 상세 페이지 주변 관광지 반경 (km)
+NEARBY_RADIUS_KM = 5.0
+
+
+async def _within(coro, timeout: float, default, label: str):
+    """
+    timeout 안에 끝나지 않으면 default 반환
+    작업 자체는 취소하지 않고 계속 진행 → 캐시를 채워 다음 요청부터 바로 사용
+    """
+    task = asyncio.ensure_future(coro)
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        print(f"⏱️ {label} 응답 지연 → 생략하고 렌더링")
+    except Exception as e:
+        print(f"❌ {label} 실패: {e}")
+    return default
+
+
+def _load_place_for_detail(db: Session, contentid: int):
+    place = (
+        db.query(Place)
+        .options(selectinload(Place.hashtags).joinedload(PlaceTag.tag))
+        .filter(Place.contentid == contentid)
+        .first()
+    )
+    return place
+
+
+def _query_nearby_places(db: Session, place: Place) -> list[dict]:
+    if place.mapx is None or place.mapy is None:
+        return []
+    return find_nearby_places(
+        db, place.mapy, place.mapx,
+        k=20, radius_km=NEARBY_RADIUS_KM, exclude_contentid=place.contentid,
+    )
+
+
+#관광지 검색 (JSON)
+@router.get("/search")
+def search_places_json(
+    q: str = Query(..., min_length=1, max_length=100),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    contenttypeid: int | None = None,
+    db: Session = Depends(get_db),
+):
+    '''
+    #제목/개요 전문 검색 - 관련도순, 접두어 일치
+    '''
+    return search_places(db, q, page=page, per_page=per_page, contenttypeid=contenttypeid)
+
+#주변 관광지 조회 (JSON)
+@router.get("/nearby")
+def read_nearby_places(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(20, ge=1, le=200),
+    radius_km: float | None = Query(None, gt=0, le=100),
+    contenttypeid: int | None = None,
+    exclude: str | None = None,
+    db: Session = Depends(get_db),
+):
+    '''
+    #(lat, lng) 기준 실제 거리순 가까운 관광지 k개
+    '''
+    return find_nearby_places(
+        db, lat, lng,
+        k=k, radius_km=radius_km, contenttypeid=contenttypeid, exclude_contentid=exclude,
+    )
+
 #템플릿 상세 조회
 @router.get("/detail/{contentid}")
-def read_place_detail(
+async def read_place_detail(
     request: Request,
     contentid: int,
     db: Session = Depends(get_db),
@@ -67,57 +235,33 @@ def read_place_detail(
 ):
     """
     특정 관광지 상세 조회 및 HTML 렌더링
+    이미지/소개정보(TourAPI)와 주변 관광지(DB)를 동시에 조회
     """
-    # Place 기본 정보
-    place = db.query(Place).filter(Place.contentid == contentid).first()
+    # Place 기본 정보 + 해시태그 (DB 작업은 스레드에서)
+    place = await asyncio.to_thread(_load_place_for_detail, db, contentid)
     if not place:
         raise HTTPException(status_code=404, detail="Place not found")
-    
-    # 해시태그 가져오기
+
     hashtags = [pt.tag for pt in place.hashtags]  # Place → PlaceTag → Tag
-    
-    detail_images = fetch_detail_images(str(contentid))
-    
-    contenttypeid = place.contenttypeid  
-    
-    detail_info = fetch_detail_info(str(contentid), str(contenttypeid))
-    
-    print("📌 contenttypeid =", contenttypeid)
 
-    # 상세정보가 PlaceDetail에 있다면 가져오기
-    detail = db.query(PlaceDetail).filter_by(place_id=contentid).first()
-    
-    # places_detail 라우터 예시
-    nearby_places = db.query(Place).filter(
-        Place.mapx.isnot(None),
-        Place.mapy.isnot(None),
-        Place.mapy.between(place.mapy - 0.045, place.mapy + 0.045),
-        Place.mapx.between(place.mapx - 0.045, place.mapx + 0.045),
-        Place.contentid != contentid  # 자기 자신 제외
-    ).order_by(
-        func.abs(Place.mapy - place.mapy) + func.abs(Place.mapx - place.mapx)
-    ).limit(20).all()
-    
-    def place_to_dict(p):
-        return {
-            "contentid": p.contentid,
-            "title": p.title,
-            "addr1": p.addr1 or "",
-            "mapx": float(p.mapx) if p.mapx else None,
-            "mapy": float(p.mapy) if p.mapy else None,
-            "contenttypeid": p.contenttypeid
-        }
-    
-    nearby_places = [place_to_dict(p) for p in nearby_places]
-    
+    # TourAPI 이미지/소개정보 (Redis → DB → TourAPI 순 캐시 조회) + 주변 관광지
+    detail_images, detail_info, nearby_places = await asyncio.gather(
+        _within(
+            get_detail_images_cached(place.id, str(contentid)),
+            DETAIL_RENDER_TIMEOUT, [], "detailImage2",
+        ),
+        _within(
+            get_detail_info_cached(place.id, str(contentid), str(place.contenttypeid)),
+            DETAIL_RENDER_TIMEOUT, None, "detailIntro2",
+        ),
+        asyncio.to_thread(_query_nearby_places, db, place),
+    )
 
-    
     return templates.TemplateResponse(
         "places_detail.html",
         {
             "request": request,
             "place": place,
-            "detail": detail,
             "hashtags": hashtags,
             "nearby_places": nearby_places,
             "current_user": current_user,
@@ -129,121 +273,102 @@ def read_place_detail(
   
 # 목록 필터링  
 @router.get("/list")
-def list_places_filtered(
+async def list_places_filtered(
     request: Request,
     page: int = 1,
-    sort: str = "updated",  # 'updated' 최신순, 'created' 오래된순
+    sort: str = "updated",  # 'updated' 최신순, 'created' 오래된순, 'relevance' 관련도순
     contenttypeid: str  |  None = None,  # 관광타입 필터
     addr: str = None,  # addr1 앞 2글자 필터
     search: str = None,
     tag: str = None,
+    cursor: str | None = None,  # 이전/다음 링크의 커서 (있으면 page는 표시용)
     template: str = "places_list.html", 
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
 ):
-    
-    print(">>> /places/list current_user =", current_user.id if current_user else None)
-    per_page = 10  # 페이지당 항목 수 고정
-    offset = (page - 1) * per_page
-
-    ctx = build_places_context(
-        request=request,
-        db=db,
-        page=page,
-        sort=sort,
-        contenttypeid=contenttypeid,
-        addr=addr,
-        search=search,
-        tag=tag,
-        current_user=current_user,
-    )
-
-    query = db.query(Place)
-
-    # contenttypeid 필터 (안전하게 수정)
-    # ✅ 안전한 int 변환
-    if contenttypeid and contenttypeid.isdigit():
-        query = query.filter(Place.contenttypeid == int(contenttypeid))
-        
-
-    # addr1 앞 2글자 필터
-    if addr:
-        query = query.filter(Place.addr1.startswith(addr))
-        
-    if search:
-        keyword = f"%{search}%"
-        query = query.filter(
-            or_(
-                Place.title.ilike(keyword),
-                Place.overview.ilike(keyword)
+    def render() -> str:
+        try:
+            ctx = build_places_context(
+                request=request,
+                db=db,
+                page=page,
+                sort=sort,
+                contenttypeid=contenttypeid,
+                addr=addr,
+                search=search,
+                tag=tag,
+                current_user=current_user,
+                cursor=cursor,
             )
-        )
-    # 해시태그 필터
-    if tag:
-        print(f"🔍 태그 검색: '{tag}'")
-        query = query.join(PlaceTag).join(Tag).filter(
-            Tag.name.ilike(f"%{tag}%")
-        ).distinct(Place.id)  # 중복 제거
-    
-    # 정렬
-    if sort == "updated":
-        query = query.order_by(
-            case((Place.firstimage != '', 1), else_=0).desc(),  # firstimage 있는 것 먼저
-            Place.updated_at.desc()  # 최신순
-        )
-    elif sort == "created":
-        query = query.order_by(
-            case((Place.firstimage != '', 1), else_=0).desc(),  # firstimage 있는 것 먼저
-            Place.created_at.asc()  # 오래된순
-        )
-    else:
-        query = query.order_by(
-            case((Place.firstimage != '', 1), else_=0).desc(),
-            Place.id.desc()                       # 기본 정렬
-        )
-
-    total = query.count()
-    total_pages = (total + per_page - 1) // per_page
-    places = query.offset(offset).limit(per_page).all()
-    
-    pref_summary = None
-    if current_user:
-        places, pref_summary = sort_places_with_preferences(db, current_user.id, places)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return templates.get_template(template).render({"request": request, **ctx})
 
-    return templates.TemplateResponse(
-        template,
-        {"request": request, **ctx},
-    )
-    
-@router.get("/recommend")
-def recommend_places(
+    if current_user is None:
+        # 비로그인 화면은 같은 조건이면 동일 → 렌더링 결과 캐시
+        params = {
+            "page": page, "sort": sort, "contenttypeid": contenttypeid,
+            "addr": addr, "search": search, "tag": tag, "cursor": cursor, "template": template,
+        }
+        return await cached_page(request, params, render)
+
+    return HTMLResponse(await run_in_threadpool(render))
+
+# 목록 필터링 (JSON)
+@router.get("/list/json")
+def list_places_json(
+    page: int = Query(1, ge=1),
+    sort: str = "updated",
+    contenttypeid: str | None = None,
+    addr: str | None = None,
+    search: str | None = None,
+    tag: str | None = None,
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor / prev_cursor (있으면 page 대신 사용)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User | None = Depends(get_current_user_optional),
 ):
-    base_query = db.query(Place)
-    places: list[Place] = base_query.limit(50).all()
-
-    sorted_places, summary, score_map = sort_places_with_preferences(
-        db, current_user.id, places
+    plan = PlaceListPlan(
+        page=page, sort=sort, contenttypeid=contenttypeid,
+        addr=addr, search=search, tag=tag, cursor=cursor,
     )
-
-    top_ids = {int(p.contentid) for p in sorted_places[:TOP_N]}
-    USER_TOP_RECOMMENDED[current_user.id] = top_ids
-    print("TOP IDS FOR USER", current_user.id, top_ids)
-
+    try:
+        result = run_place_list(db, plan, current_user)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
-        "summary": summary,
+        # 커서로 넘긴 경우 몇 번째 페이지인지 알 수 없으므로 null
+        "page": None if cursor and plan.uses_keyset else page,
+        "total": result["total"],
+        "total_is_estimate": result["total_is_estimate"],
+        "total_pages": result["total_pages"],
+        "next_cursor": result["next_cursor"],
+        "prev_cursor": result["prev_cursor"],
+        "pref_summary": result["pref_summary"],
         "items": [
             {
-                "id": p.contentid,
+                "contentid": p.contentid,
                 "title": p.title,
                 "addr1": p.addr1,
                 "firstimage": p.firstimage,
-                "scores": score_map.get(p.contentid, {}),
+                "contenttypeid": p.contenttypeid,
+                "scores": result["score_map"].get(p.contentid, {}),
             }
-            for p in sorted_places
+            for p in result["places"]
         ],
     }
+    
+@router.get("/recommend")
+def recommend_places(
+    region: str | None = Query(None, min_length=2, description="주소 앞 2글자 (예: 서울, 부산)"),
+    contenttypeid: List[int] | None = Query(None),
+    limit: int = Query(TOP_N, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    entry = get_recommendations(
+        db, current_user.id, recommend_params(limit, region, contenttypeid)
+    )
+    return {"summary": entry["summary"], "items": entry["items"]}
 
 @router.get("/recommend/reason/{place_id}")
 def get_reason(
@@ -265,31 +390,51 @@ def get_reason(
     
 # places 라우터에 추가 (기존 router에)
 @router.get("/map_more")
-def map_more_page(request: Request, db: Session = Depends(get_db)):
+def map_more_page(request: Request):
     """
-    지도 전용 페이지 - 전체 관광지 데이터 + 검색 + 클러스터 + 현재위치 3km
+    지도 전용 페이지 - 관광지 데이터는 /places/map/tiles 에서 화면 영역별로 조회
     """
-    # 전체 places 데이터 (mapx, mapy 있는 것만)
-    places = get_all_places(db)
-    
-    # Jinja2에서 사용 가능한 딕셔너리 형태로 변환
-    places_dict = [
-        {
-            "contentid": p.contentid,
-            "title": p.title,
-            "addr1": p.addr1 or "",
-            "mapx": float(p.mapx) if p.mapx else None,
-            "mapy": float(p.mapy) if p.mapy else None
-        }
-        for p in places
-    ]
-    
     return templates.TemplateResponse(
         "map_more.html",
         {
             "request": request,
-            "places": places_dict
         }
     )
-    
 
+# 지도 타일 (클러스터/지점)
+@router.get("/map/tiles/{z}/{x}/{y}")
+async def map_tile(
+    z: int,
+    x: int,
+    y: int,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """
+    XYZ 타일 단위 지도 데이터
+    낮은 줌은 클러스터, 높은 줌은 개별 지점 / 관광지 데이터 버전별로 Redis 캐시
+    """
+    if not (MIN_ZOOM <= z <= MAX_ZOOM) or not (0 <= x < 2 ** z) or not (0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="Invalid tile")
+
+    version = await get_version(PLACES_CATALOG_VERSION)
+    cache_key = f"map:tile:{version}:{z}:{x}:{y}"
+    tile = await get_cached(cache_key)
+    if tile is None:
+        tile = await asyncio.to_thread(build_tile, db, z, x, y)
+        await set_cached(cache_key, tile, expire_seconds=TILE_CACHE_TTL)
+
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return tile
+
+# 지도 검색
+@router.get("/map/search")
+def map_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(200, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    지도 페이지 검색 (제목/주소)
+    """
+    return search_map_points(db, q, limit=limit)
@@ -2,7 +2,8 @@ from pydantic import BaseModel
 from typing import Optional, List
 
 class PlaceResponse(BaseModel):
-    content_id: str
+    id: int
+    contentid: str
     title: str
     addr1: Optional[str]
     overview: Optional[str]
@@ -0,0 +1,329 @@
+# app/services/co_favorites.py
+"""
+즐겨찾기 동시 출현(item-item) 모델
+
+- 같은 사용자가 함께 즐겨찾기한 장소 쌍의 수를 CSR 형태(numpy 배열 3개)로 보관
+- 즐겨찾기 추가/해제는 Redis 목록에 변경분으로 쌓고, 각 워커가 읽어서 메모리 모델에 바로 반영
+- 주기적으로 변경분을 비우고 버전을 올려 각 워커가 DB에서 다시 만들도록 함
+- 장소 키는 place_features와 같은 Place.id (favorites.place_id 는 contentid)
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.favorite import Favorite
+from app.models.places import Place
+from app.services.place_features import get_feature_matrix
+from app.services.recommend_engine import score_place_ids
+from app.utils.redis_client import redis_sync_client, get_version_sync
+
+CO_FAVORITES_VERSION = "co_favorites"
+DELTAS_KEY = "recommend:cofav:deltas"
+COMPACT_LOCK_KEY = "recommend:cofav:compact:lock"
+# 변경분을 비우고 전체 재생성하는 주기 (분) - 스케줄러에서 사용
+CO_FAVORITES_REBUILD_MINUTES = int(os.getenv("CO_FAVORITES_REBUILD_MINUTES", "60"))
+# 워커별 모델 재생성 주기 (초) - 버전이 바뀌면 그 전에도 재생성
+CO_FAVORITES_TTL = int(os.getenv("CO_FAVORITES_TTL", "7200"))
+VERSION_CHECK_INTERVAL = 10
+# 한 사용자에서 쌍을 만들 최대 즐겨찾기 수 (최근 순) - 쌍 개수가 제곱으로 늘어나는 것 방지
+MAX_ITEMS_PER_USER = 200
+# 최종 점수 = 선호도 점수 * (1 - w) + 동시 출현 점수 * w
+CO_FAVORITES_WEIGHT = float(os.getenv("CO_FAVORITES_WEIGHT", "0.3"))
+# 선호도 순위 밖에서 추가로 섞을 동시 출현 상위 장소 수
+CO_FAVORITES_CANDIDATES = 50
+
+
+class CoFavoriteModel:
+    """
+    place_ids: 즐겨찾기된 장소 (오름차순)
+    indptr / indices / data: 장소 i와 함께 즐겨찾기된 장소 indices[indptr[i]:indptr[i+1]] 와 그 횟수
+    counts: 장소별 즐겨찾기 사용자 수
+    members: 생성 시점의 (user_id, place_id) 키 (오름차순) - 변경분 중복 반영 방지용
+    extra / extra_counts / extra_members: 생성 이후 들어온 변경분
+    """
+
+    def __init__(self, place_ids, indptr, indices, data, counts, members, version: int, applied: int):
+        self.place_ids = place_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.counts = counts
+        self.members = members
+        self.extra: dict[int, dict[int, float]] = {}
+        self.extra_counts: dict[int, float] = {}
+        self.extra_members: dict[int, bool] = {}
+        self.version = version
+        self.applied = applied
+        self.loaded_at = time.monotonic()
+        self.checked_at = self.loaded_at
+
+    def _position(self, place_id: int) -> int:
+        pos = int(np.searchsorted(self.place_ids, place_id))
+        if pos < len(self.place_ids) and self.place_ids[pos] == place_id:
+            return pos
+        return -1
+
+    def _count(self, place_id: int) -> float:
+        pos = self._position(place_id)
+        base = float(self.counts[pos]) if pos >= 0 else 0.0
+        return base + self.extra_counts.get(place_id, 0.0)
+
+    def _is_member(self, key: int) -> bool:
+        if key in self.extra_members:
+            return self.extra_members[key]
+        pos = int(np.searchsorted(self.members, key))
+        return pos < len(self.members) and self.members[pos] == key
+
+    def apply_delta(self, user_id: int, place_id: int, others: list[int], sign: int):
+        """
+        즐겨찾기 추가(sign=1)/해제(sign=-1) 반영
+        이미 같은 상태(생성 시 DB에 포함됐거나 같은 변경분을 다시 읽은 경우)면 무시
+        """
+        key = member_key(user_id, place_id)
+        if self._is_member(key) == (sign > 0):
+            return
+        self.extra_members[key] = sign > 0
+
+        self.extra_counts[place_id] = self.extra_counts.get(place_id, 0.0) + sign
+        for other in others:
+            if other == place_id:
+                continue
+            for a, b in ((place_id, other), (other, place_id)):
+                row = self.extra.setdefault(a, {})
+                row[b] = row.get(b, 0.0) + sign
+
+    def similar(self, seeds: list[int], limit: int = 50) -> dict[int, float]:
+        """
+        seeds와 함께 즐겨찾기된 장소 → 점수 (코사인 유사도 합, 최댓값 1로 정규화)
+        seeds 자신은 제외
+        """
+        seeds = set(seeds)
+        acc = np.zeros(len(self.place_ids))
+        outside: dict[int, float] = {}
+        for seed in seeds:
+            seed_count = self._count(seed)
+            if seed_count <= 0:
+                continue
+            weight = 1.0 / np.sqrt(seed_count)
+            pos = self._position(seed)
+            if pos >= 0:
+                start, end = self.indptr[pos], self.indptr[pos + 1]
+                # 한 행 안의 indices는 중복이 없으므로 바로 더해도 됨
+                acc[self.indices[start:end]] += self.data[start:end] * weight
+            for other, value in self.extra.get(seed, {}).items():
+                other_pos = self._position(other)
+                if other_pos >= 0:
+                    acc[other_pos] += value * weight
+                else:
+                    outside[other] = outside.get(other, 0.0) + value * weight
+
+        nonzero = np.flatnonzero(acc > 0)
+        raw = dict(zip(self.place_ids[nonzero].tolist(), acc[nonzero].tolist()))
+        for place_id, value in outside.items():
+            if value > 0:
+                raw[place_id] = value
+
+        scores = {}
+        for place_id, value in raw.items():
+            if place_id in seeds:
+                continue
+            count = self._count(place_id)
+            if count > 0:
+                scores[place_id] = value / np.sqrt(count)
+        if not scores:
+            return {}
+
+        top = sorted(scores.items(), key=lambda kv: (-kv[1], -kv[0]))[:limit]
+        best = top[0][1]
+        return {place_id: value / best for place_id, value in top}
+
+
+def member_key(user_id, place_id):
+    """
+    (user_id, place_id) → 정렬/검색용 정수 키 (numpy 배열도 그대로 사용 가능)
+    """
+    return (user_id << 32) | place_id
+
+
+# ------------------------------------------
+# 생성 (DB 즐겨찾기 전체 → CSR)
+# ------------------------------------------
+def build_co_favorite_model(db: Session, version: int, applied: int) -> CoFavoriteModel:
+    rows = (
+        db.query(Favorite.user_id, Place.id)
+        .join(Place, Place.contentid == Favorite.place_id)
+        .order_by(Favorite.user_id, Favorite.created_at.desc())
+        .all()
+    )
+    users = np.array([r[0] for r in rows], dtype=np.int64)
+    items = np.array([r[1] for r in rows], dtype=np.int64)
+    place_ids = np.unique(items)
+    n = len(place_ids)
+    item_idx = np.searchsorted(place_ids, items)
+    counts = np.bincount(item_idx, minlength=n).astype(np.float32)
+
+    # 사용자별 구간 → 구간 안의 모든 순서쌍
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(users)) + 1, [len(users)]]) if len(users) else np.array([0])
+    keys = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        group = item_idx[start:min(end, start + MAX_ITEMS_PER_USER)]
+        if len(group) < 2:
+            continue
+        a = np.repeat(group, len(group))
+        b = np.tile(group, len(group))
+        keep = a != b
+        keys.append(a[keep] * n + b[keep])
+
+    if keys:
+        pair_keys, pair_counts = np.unique(np.concatenate(keys), return_counts=True)
+    else:
+        pair_keys, pair_counts = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows_idx = pair_keys // max(n, 1)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows_idx, minlength=n))]).astype(np.int64)
+    indices = (pair_keys % max(n, 1)).astype(np.int32)
+    data = pair_counts.astype(np.float32)
+
+    members = np.unique(member_key(users, items))
+    return CoFavoriteModel(place_ids, indptr, indices, data, counts, members, version, applied)
+
+
+_model: CoFavoriteModel | None = None
+_model_lock = threading.Lock()
+
+
+def _current_version() -> int:
+    try:
+        return get_version_sync(CO_FAVORITES_VERSION)
+    except Exception:
+        return -1
+
+
+def _apply_pending(model: CoFavoriteModel):
+    """
+    Redis 변경분 중 아직 반영하지 않은 것만 반영
+    """
+    try:
+        pending = redis_sync_client.lrange(DELTAS_KEY, model.applied, -1)
+    except Exception:
+        return
+    for raw in pending:
+        delta = json.loads(raw)
+        model.apply_delta(delta["user_id"], delta["place_id"], delta["others"], delta["sign"])
+    model.applied += len(pending)
+
+
+def get_co_favorite_model(db: Session) -> CoFavoriteModel:
+    global _model
+    model = _model
+    now = time.monotonic()
+    if model is not None and now - model.loaded_at < CO_FAVORITES_TTL:
+        if now - model.checked_at < VERSION_CHECK_INTERVAL:
+            return model
+        model.checked_at = now
+        if _current_version() == model.version:
+            with _model_lock:
+                _apply_pending(model)
+            return model
+
+    with _model_lock:
+        if _model is None or _model is model:
+            started = time.monotonic()
+            version = _current_version()
+            # 목록에 이미 있는 변경분은 DB에도 반영되어 있으므로 건너뜀
+            # (길이를 읽은 뒤 DB 조회 전에 들어온 변경분은 apply_delta에서 중복이면 무시)
+            try:
+                applied = redis_sync_client.llen(DELTAS_KEY)
+            except Exception:
+                applied = 0
+            _model = build_co_favorite_model(db, version, applied)
+            print(
+                f"❤️ 즐겨찾기 동시 출현 모델 생성: {len(_model.place_ids)}개 장소, "
+                f"{len(_model.indices)}개 쌍 ({time.monotonic() - started:.1f}s)"
+            )
+        return _model
+
+
+def blend_co_favorites(
+    db: Session,
+    prefs: dict,
+    ranked: list[tuple[int, dict]],
+    seeds: list[int],
+    top_n: int,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> list[tuple[int, dict]]:
+    """
+    선호도 순위(ranked)에 동시 출현 점수를 섞어 상위 top_n개
+    동시 출현 상위 장소가 ranked에 없으면 선호도 점수를 계산해 후보에 추가
+    """
+    similar = get_co_favorite_model(db).similar(seeds, CO_FAVORITES_CANDIDATES) if seeds else {}
+    if not similar:
+        return ranked[:top_n]
+
+    candidates = dict(ranked)
+    missing = [place_id for place_id in similar if place_id not in candidates]
+    if missing:
+        matrix = get_feature_matrix(db)
+        candidates.update(score_place_ids(matrix, prefs, missing, region, contenttypeids))
+
+    blended = []
+    for place_id, scores in candidates.items():
+        co_score = similar.get(place_id, 0.0)
+        total = scores["total"] * (1 - CO_FAVORITES_WEIGHT) + co_score * CO_FAVORITES_WEIGHT
+        blended.append((place_id, {**scores, "co_favorite": co_score, "total": total}))
+    blended.sort(key=lambda item: (-round(item[1]["total"], 6), -item[0]))
+    return blended[:top_n]
+
+
+# ------------------------------------------
+# 변경분 기록 / 정리
+# ------------------------------------------
+def favorite_place_ids(db: Session, user_id: int) -> list[int]:
+    """
+    사용자가 즐겨찾기한 장소의 Place.id
+    """
+    rows = (
+        db.query(Place.id)
+        .join(Favorite, Favorite.place_id == Place.contentid)
+        .filter(Favorite.user_id == user_id)
+        .all()
+    )
+    return [r[0] for r in rows]
+
+
+def record_favorite_change(db: Session, user_id: int, contentid: int, added: bool):
+    """
+    즐겨찾기 추가/해제 후 호출 - 변경분을 Redis에 쌓아 모든 워커가 반영
+    """
+    place = db.query(Place.id).filter(Place.contentid == contentid).first()
+    if not place:
+        return
+    others = [pid for pid in favorite_place_ids(db, user_id) if pid != place.id]
+    delta = {
+        "user_id": user_id,
+        "place_id": place.id,
+        "others": others[:MAX_ITEMS_PER_USER],
+        "sign": 1 if added else -1,
+    }
+    try:
+        redis_sync_client.rpush(DELTAS_KEY, json.dumps(delta))
+    except Exception as e:
+        print(f"⚠️ 즐겨찾기 변경분 기록 실패: {e}")
+
+
+def compact_co_favorites():
+    """
+    변경분 목록을 비우고 버전을 올림 → 각 워커가 DB에서 모델을 다시 생성
+    주기마다 한 워커에서만 실행되도록 락은 주기만큼 유지
+    """
+    lock_ttl = max(CO_FAVORITES_REBUILD_MINUTES * 60 - 30, 60)
+    if not redis_sync_client.set(COMPACT_LOCK_KEY, "1", nx=True, ex=lock_ttl):
+        return
+    pipe = redis_sync_client.pipeline()
+    pipe.delete(DELTAS_KEY)
+    pipe.incr(f"version:{CO_FAVORITES_VERSION}")
+    pipe.execute()
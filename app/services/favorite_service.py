@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from app.models.favorite import Favorite
 from app.models.places import Place 
+from app.services.place_projection import PlaceCardRow, project
+from app.services.co_favorites import record_favorite_change
+from app.services.recommend_store import invalidate_recommendation
 
 def toggle_favorite(db: Session, user_id: int, place_id: int) -> bool:
     fav = (
@@ -11,18 +14,24 @@ def toggle_favorite(db: Session, user_id: int, place_id: int) -> bool:
     if fav:
         db.delete(fav)
         db.commit()
+        _on_favorites_changed(db, user_id, place_id, added=False)
         return False     # 좋아요 해제
     new_fav = Favorite(user_id=user_id, place_id=place_id)
     db.add(new_fav)
     db.commit()
+    _on_favorites_changed(db, user_id, place_id, added=True)
     return True          # 좋아요 설정
 
-def get_my_favorites(db: Session, user_id: int):
+def _on_favorites_changed(db: Session, user_id: int, place_id: int, added: bool):
+    # 동시 출현 모델에 변경분 반영 + 이 사용자의 저장된 추천 결과 무효화
+    record_favorite_change(db, user_id, place_id, added)
+    invalidate_recommendation(user_id)
+
+def get_my_favorites(db: Session, user_id: int) -> list[PlaceCardRow]:
     q = (
         db.query(Place)
         .join(Favorite, Favorite.place_id == Place.contentid)
         .filter(Favorite.user_id == user_id)
         .order_by(Favorite.created_at.desc())
-        .all()
     )
-    return q
+    return project(q, PlaceCardRow)
@@ -1,16 +1,21 @@
 # app/services/hashtag.py
 
 from collections import Counter
-from konlpy.tag import Okt
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 
-from app.models.hashtag import Tag, PlaceTag
+from app.models.hashtag import Tag
 from app.models.places import Place
-from app.services.places import save_places_to_db
-
-okt = Okt()
+from app.services import tokenizer
+from app.services.place_projection import PlaceCardRow, project
+from app.services.tag_index import get_tag_index, parse_tags
+from app.services.hashtag_engine import (
+    get_hashtag_job_progress,
+    run_hashtag_job,
+    try_acquire_hashtag_job,
+    write_place_hashtags,
+)
 
 # ------------------------------------------
 # 기본 관광 타입 기반 해시태그
@@ -45,12 +50,15 @@ STOPWORDS = ["관광지", "장소", "소개", "대한", "여행", "지역", "한
 # ------------------------------------------
 # 1. 키워드 추출
 # ------------------------------------------
-def extract_keywords(text: str, top_n: int = 5):
-    nouns = okt.nouns(text)
+def top_keywords(nouns: list[str], top_n: int = 5):
     filtered = [word for word in nouns if len(word) > 1 and word not in STOPWORDS]
     freq = Counter(filtered)
     return [word for word, _ in freq.most_common(top_n)]
 
+
+def extract_keywords(text: str, top_n: int = 5):
+    return top_keywords(tokenizer.nouns(text), top_n)
+
 # ------------------------------------------
 # 2. DB에서 모든 태그 캐시 로딩
 # ------------------------------------------
@@ -59,90 +67,78 @@ def load_all_tags(db: Session):
     return {tag.name: tag for tag in tags}
 
 # ------------------------------------------
-# 2. 특정 Place에 대해 해시태그 생성
+# 2. 장소 정보 → 해시태그 이름 (DB 접근 없음, 배치 엔진 워커에서도 사용)
 # ------------------------------------------
-def generate_hashtags_fast(db: Session, place_id: int, tag_cache: dict):
-    place = db.query(Place).filter(Place.id == place_id).first()
-    if not place:
-        return []
-
+def compute_place_hashtags(contenttypeid: int | None, overview: str | None, addr1: str | None) -> set[str]:
     hashtags = set()
 
     # 1) 관광 타입 기반 기본 태그
-    #content_tags = CONTENT_TYPE_HASHTAGS.get(place.contenttypeid, [])
-    #hashtags.update(content_tags)
-    hashtags.update(CONTENT_TYPE_HASHTAGS.get(place.contenttypeid, []))
-
+    hashtags.update(CONTENT_TYPE_HASHTAGS.get(contenttypeid, []))
 
     # 2) overview 기반 주요 키워드
-    if place.overview:
-        keywords = extract_keywords(place.overview)
+    if overview:
+        # 개요/주소를 한 번에 분석
+        overview_nouns, addr_nouns = tokenizer.nouns_batch([overview, addr1 or ""])
+        keywords = top_keywords(overview_nouns)
         #주소관련 해시태그 생성금지
-        if place.addr1:
-            addr_words = set(extract_keywords(place.addr1))
+        if addr1:
+            addr_words = set(top_keywords(addr_nouns))
             keywords = [kw for kw in keywords if kw not in addr_words]
         hashtags.update(keywords)
 
     # 3) 계절/테마 태그 (overview에 특정 키워드 포함 시)
-    if place.overview:
-        overview_text = place.overview.lower()
+    if overview:
         for key, tag in SEASON_KEYWORDS.items():
-            if key in place.overview:
+            if key in overview:
                 hashtags.add(tag.lstrip("#"))
 
-    # 기존 PlaceTag 조회
-    existing = db.query(PlaceTag).filter(PlaceTag.place_id == place_id).all()
-    existing_tag_ids = {pt.tag_id for pt in existing}
-
-    results = []
+    return hashtags
 
-    for name in hashtags:
-        if name in tag_cache:
-            tag = tag_cache[name]
-        else:
-            tag = Tag(name=name, slug=name.lower())
-            db.add(tag)
-            db.flush()
-            tag_cache[name] = tag
 
-        if tag.id not in existing_tag_ids:
-            db.add(PlaceTag(place_id=place_id, tag_id=tag.id))
-
-        results.append(f"#{name}")
-
-    return results
+# ------------------------------------------
+# 2. 특정 Place에 대해 해시태그 생성
+# ------------------------------------------
+def generate_hashtags_fast(db: Session, place_id: int):
+    """
+    장소 하나의 해시태그 재생성 → ["#태그", ...] (배치 엔진과 같은 저장 경로, commit 포함)
+    """
+    hashtags = write_place_hashtags(db, place_id)
+    if hashtags is None:
+        return []
+    return [f"#{name}" for name in hashtags]
 
 
 # ------------------------------------------
 # 3. 해시태그 기반 장소 검색
 # ------------------------------------------
-def search_places_by_hashtag(db: Session, hashtag: str):
-    tag = db.query(Tag).filter(Tag.slug == hashtag.lower()).first()
-    if not tag:
-        return []
-
-    place_ids = [pt.place_id for pt in tag.places]
-    return db.query(Place).filter(Place.id.in_(place_ids)).all()
+def search_places_by_hashtag(db: Session, hashtag: str, mode: str = "and", page: int = 1, per_page: int = 20) -> dict:
+    """
+    태그 역색인으로 장소 검색 ("a,b" + mode=and/or), 최신 등록순 페이지
+    """
+    ids = get_tag_index(db).query(parse_tags(hashtag), mode)[::-1]
+    page_ids = [int(i) for i in ids[(page - 1) * per_page: page * per_page]]
+    places = []
+    if page_ids:
+        rows = project(db.query(Place).filter(Place.id.in_(page_ids)), PlaceCardRow)
+        by_id = {row.id: row for row in rows}
+        places = [by_id[i] for i in page_ids if i in by_id]
+    return {"total": len(ids), "page": page, "per_page": per_page, "places": places}
 
 
 # ------------------------------------------
 # 4. DB 저장 + 해시태그 생성 (API용)
 # -----------------------------------------
 def generate_hashtags_for_all_saved_places_service(db: Session, batch_size: int = 1000):
-    places = db.query(Place).all()
-    tag_cache = load_all_tags(db)
-    total_tags_generated = 0
-
-    for i in range(0, len(places), batch_size):
-        batch = places[i:i + batch_size]
-        for place in batch:
-            tags = generate_hashtags_fast(db, place.id, tag_cache)
-            total_tags_generated += len(tags)
-        db.commit()  # 배치 단위 commit → 안정성 증가
-        print(f"[진행 상황] {i + len(batch)} / {len(places)} Place 처리 완료, 총 해시태그 생성: {total_tags_generated}")
-
+    """
+    전체 장소 해시태그 생성 (동기 실행 - 스크립트용)
+    API에서는 hashtag_engine 작업을 백그라운드로 실행하고 진행 상황을 조회
+    """
+    if not try_acquire_hashtag_job():
+        return {"message": "해시태그 생성 작업이 이미 진행 중입니다", "progress": get_hashtag_job_progress()}
+
+    progress = run_hashtag_job(batch_size=batch_size)
     return {
-        "message": "고속 배치 해시태그 생성 완료!",
-        "num_of_places": len(places),
-        "total_hashtags_created": total_tags_generated,
-    }
\ No newline at end of file
+        "message": "고속 배치 해시태그 생성 완료!" if progress["status"] == "done" else "해시태그 생성 실패",
+        "num_of_places": progress.get("processed", 0),
+        "total_hashtags_created": progress.get("place_tags_added", 0),
+    }
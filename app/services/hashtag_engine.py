@@ -0,0 +1,313 @@
+# app/services/hashtag_engine.py
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import bindparam, func, or_, tuple_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from app.database import SessionLocal
+from app.models.hashtag import Tag, PlaceTag
+from app.models.places import Place
+from app.services.tokenizer import use_local_tokenizer
+from app.utils.redis_client import redis_sync_client
+
+# 형태소 분석 프로세스 수 (Okt는 프로세스마다 JVM을 하나씩 띄움)
+HASHTAG_WORKERS = int(os.getenv("HASHTAG_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+# DB에서 읽고 쓰는 단위 (이 단위로 commit)
+HASHTAG_BATCH_SIZE = int(os.getenv("HASHTAG_BATCH_SIZE", "1000"))
+# 워커 하나에 넘기는 장소 수
+ANALYZE_CHUNK_SIZE = 50
+
+HASHTAG_JOB_LOCK_KEY = "hashtags:job:lock"
+HASHTAG_JOB_PROGRESS_KEY = "hashtags:job:progress"
+HASHTAG_JOB_LOCK_TTL = 60 * 60 * 3
+# 수집/동기화로 내용이 바뀌었을 수 있는 장소 (contentid 집합)
+HASHTAG_QUEUE_KEY = "hashtags:queue"
+
+# 태그 규칙(불용어/키워드 표 등)을 바꾸면 올려서 전체 재생성
+HASHTAG_RULES_VERSION = "1"
+
+
+def tag_fingerprint_expr():
+    """
+    태그 생성 입력(관광타입/개요/주소 + 규칙 버전)의 SHA1 - DB에서 계산해 overview를 읽기 전에 비교
+    """
+    return func.sha1(func.concat_ws(
+        "|", HASHTAG_RULES_VERSION, Place.contenttypeid,
+        func.coalesce(Place.overview, ""), func.coalesce(Place.addr1, ""),
+    ))
+
+
+def _fingerprint_changed():
+    return or_(Place.tag_fingerprint.is_(None), Place.tag_fingerprint != tag_fingerprint_expr())
+
+
+def enqueue_hashtag_places(contentids: list[str]):
+    """
+    수집/동기화에서 저장한 장소를 태그 재생성 대기열에 추가
+    """
+    if contentids:
+        redis_sync_client.sadd(HASHTAG_QUEUE_KEY, *contentids)
+
+
+# ------------------------------------------
+# 진행 상황 (Redis)
+# ------------------------------------------
+def get_hashtag_job_progress() -> dict | None:
+    data = redis_sync_client.get(HASHTAG_JOB_PROGRESS_KEY)
+    return json.loads(data) if data else None
+
+
+def is_hashtag_job_running() -> bool:
+    return bool(redis_sync_client.exists(HASHTAG_JOB_LOCK_KEY))
+
+
+def _save_progress(progress: dict):
+    progress["updated_at"] = int(time.time())
+    redis_sync_client.set(HASHTAG_JOB_PROGRESS_KEY, json.dumps(progress), ex=60 * 60 * 24 * 7)
+
+
+def try_acquire_hashtag_job() -> bool:
+    """
+    작업 시작 전 잠금 (여러 워커/요청에서 동시에 실행되지 않도록)
+    """
+    acquired = redis_sync_client.set(HASHTAG_JOB_LOCK_KEY, "1", nx=True, ex=HASHTAG_JOB_LOCK_TTL)
+    if acquired:
+        _save_progress({"status": "queued"})
+    return bool(acquired)
+
+
+# ------------------------------------------
+# 워커 프로세스 (형태소 분석만 수행, DB 접근 없음)
+# ------------------------------------------
+def _analyze_chunk(items: list[tuple]) -> list[tuple[int, list[str]]]:
+    from app.services.hashtag import compute_place_hashtags
+
+    return [
+        (place_id, sorted(compute_place_hashtags(contenttypeid, overview, addr1)))
+        for place_id, contenttypeid, overview, addr1, _ in items
+    ]
+
+
+def _create_pool() -> ProcessPoolExecutor:
+    # JVM이 떠 있는 프로세스를 fork하면 멈출 수 있으므로 spawn 사용
+    return ProcessPoolExecutor(
+        max_workers=HASHTAG_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=use_local_tokenizer,
+    )
+
+
+# ------------------------------------------
+# 배치 저장 (Tag / PlaceTag 일괄 INSERT)
+# ------------------------------------------
+def tag_slug(name: str) -> str:
+    return name.lower()
+
+
+def _ensure_tags(db, names: set[str]) -> dict[str, int]:
+    """
+    태그 이름 → id (없는 태그는 한 번에 INSERT, 동시 생성은 IGNORE로 흡수)
+    slug가 unique라 대소문자만 다른 이름은 같은 태그로 묶이므로 slug 기준으로 조회
+    """
+    if not names:
+        return {}
+    slugs = {tag_slug(name): name for name in sorted(names)}
+    by_slug = dict(db.query(Tag.slug, Tag.id).filter(Tag.slug.in_(slugs)).all())
+    missing = slugs.keys() - by_slug.keys()
+    if missing:
+        db.execute(
+            mysql_insert(Tag.__table__).prefix_with("IGNORE"),
+            [{"name": slugs[slug], "slug": slug} for slug in sorted(missing)],
+        )
+        by_slug.update(db.query(Tag.slug, Tag.id).filter(Tag.slug.in_(missing)).all())
+    return {name: by_slug[tag_slug(name)] for name in names if tag_slug(name) in by_slug}
+
+
+def _write_batch(db, results: list[tuple[int, list[str]]], fingerprints: dict[int, str]) -> tuple[int, int, int]:
+    """
+    배치 결과 저장 → (새 태그 수, 새 PlaceTag 수, 삭제한 PlaceTag 수)
+    - 더 이상 나오지 않는 키워드의 PlaceTag는 삭제
+    - 처리한 장소의 지문을 읽을 때 계산한 값으로 저장 (그 사이 내용이 바뀌면 다음 실행에서 다시 처리)
+    """
+    names = {name for _, tags in results for name in tags}
+    slugs = {tag_slug(name) for name in names}
+    before = db.query(Tag.id).filter(Tag.slug.in_(slugs)).count() if slugs else 0
+    tag_ids = _ensure_tags(db, names)
+
+    wanted = {(place_id, tag_ids[name]) for place_id, tags in results for name in tags if name in tag_ids}
+    existing = set()
+    if wanted:
+        place_ids = {place_id for place_id, _ in results}
+        existing = set(
+            db.query(PlaceTag.place_id, PlaceTag.tag_id)
+            .filter(PlaceTag.place_id.in_(place_ids))
+            .filter(tuple_(PlaceTag.place_id, PlaceTag.tag_id).in_(wanted))
+            .all()
+        )
+    new_pairs = wanted - existing
+    if new_pairs:
+        db.execute(
+            PlaceTag.__table__.insert(),
+            [{"place_id": place_id, "tag_id": tag_id} for place_id, tag_id in sorted(new_pairs)],
+        )
+
+    stale = db.query(PlaceTag).filter(PlaceTag.place_id.in_([place_id for place_id, _ in results]))
+    if wanted:
+        stale = stale.filter(tuple_(PlaceTag.place_id, PlaceTag.tag_id).notin_(wanted))
+    removed = stale.delete(synchronize_session=False)
+
+    db.execute(
+        update(Place.__table__)
+        .where(Place.__table__.c.id == bindparam("place_id"))
+        .values(tag_fingerprint=bindparam("fingerprint")),
+        [{"place_id": place_id, "fingerprint": fp} for place_id, fp in fingerprints.items()],
+    )
+    db.commit()
+    return len(set(tag_ids.values())) - before, len(new_pairs), removed
+
+
+def write_place_hashtags(db, place_id: int) -> list[str] | None:
+    """
+    장소 하나의 해시태그를 바로 재생성 (API용, 배치와 같은 저장 경로)
+    - 사라진 PlaceTag 삭제 + 지문 갱신까지 하므로 다음 배치에서 다시 처리하지 않음
+    장소가 없으면 None
+    """
+    row = (
+        db.query(
+            Place.id, Place.contenttypeid, Place.overview, Place.addr1,
+            tag_fingerprint_expr().label("fingerprint"),
+        )
+        .filter(Place.id == place_id)
+        .first()
+    )
+    if row is None:
+        return None
+    results = _analyze_chunk([tuple(row)])
+    _write_batch(db, results, {row.id: row.fingerprint})
+    return results[0][1]
+
+
+# ------------------------------------------
+# 해시태그 생성 작업 (지문이 바뀐 장소만 재생성)
+# ------------------------------------------
+def _next_rows(db, mode: str, last_id: int, batch_size: int) -> tuple[list, list[str]]:
+    """
+    다음 배치 → (행 목록, 대기열에서 꺼낸 contentid)
+    """
+    query = db.query(
+        Place.id, Place.contenttypeid, Place.overview, Place.addr1,
+        tag_fingerprint_expr().label("fingerprint"),
+    )
+    if mode != "full":
+        query = query.filter(_fingerprint_changed())
+
+    if mode == "queued":
+        popped = redis_sync_client.spop(HASHTAG_QUEUE_KEY, batch_size) or []
+        if not popped:
+            return [], []
+        return query.filter(Place.contentid.in_(popped)).all(), popped
+
+    rows = query.filter(Place.id > last_id).order_by(Place.id).limit(batch_size).all()
+    return rows, []
+
+
+def run_hashtag_job(batch_size: int = HASHTAG_BATCH_SIZE, mode: str = "changed") -> dict:
+    """
+    저장된 장소의 해시태그 생성
+    - 태그 입력 지문(tag_fingerprint)이 바뀐 장소만 필요한 컬럼을 읽고
+    - 형태소 분석은 프로세스 풀에서 병렬 처리
+    - 배치마다 Tag / PlaceTag 일괄 INSERT, 사라진 PlaceTag 삭제 후 commit
+    mode - changed: 지문이 바뀐 장소만 / queued: 대기열에 들어온 장소 중 바뀐 것만 / full: 전체
+    try_acquire_hashtag_job()으로 잠금을 잡은 뒤 호출
+    """
+    # 워커 프로세스가 이 모듈을 import할 때 웹 관련 모듈까지 읽지 않도록 함수 안에서 import
+    from app.services.page_cache import invalidate_hashtag_pages
+    from app.services.tag_suggest import refresh_tag_stats
+    from app.services.place_features import rebuild_place_features
+
+    started = time.monotonic()
+    progress: dict = {
+        "status": "running", "mode": mode, "processed": 0,
+        "tags_created": 0, "place_tags_added": 0, "place_tags_removed": 0,
+    }
+    db = SessionLocal()
+    popped: list[str] = []
+    try:
+        if mode == "queued":
+            progress["total"] = redis_sync_client.scard(HASHTAG_QUEUE_KEY)
+        elif mode == "changed":
+            progress["total"] = db.query(Place.id).filter(_fingerprint_changed()).count()
+        else:
+            progress["total"] = db.query(Place.id).count()
+        _save_progress(progress)
+
+        last_id = 0
+        pool = None
+        try:
+            while True:
+                rows, popped = _next_rows(db, mode, last_id, batch_size)
+                if not rows:
+                    if popped:
+                        continue  # 꺼낸 장소가 모두 변경 없음
+                    break
+                last_id = max(last_id, rows[-1].id)
+
+                if pool is None:
+                    pool = _create_pool()
+                items = [tuple(r) for r in rows]
+                chunks = [items[i:i + ANALYZE_CHUNK_SIZE] for i in range(0, len(items), ANALYZE_CHUNK_SIZE)]
+                results = [pair for chunk in pool.map(_analyze_chunk, chunks) for pair in chunk]
+
+                tags_created, added, removed = _write_batch(db, results, {r.id: r.fingerprint for r in rows})
+                popped = []
+                progress["processed"] += len(rows)
+                progress["tags_created"] += tags_created
+                progress["place_tags_added"] += added
+                progress["place_tags_removed"] += removed
+                _save_progress(progress)
+                print(f"[진행 상황] {progress['processed']} / {progress['total']} Place 처리 완료, 해시태그 +{progress['place_tags_added']} / -{progress['place_tags_removed']}")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        progress["status"] = "done"
+    except Exception as e:
+        db.rollback()
+        # 처리하지 못한 대기열 항목은 되돌려 놓음
+        if popped:
+            enqueue_hashtag_places(popped)
+        progress.update({"status": "failed", "error": str(e)})
+        print(f"❌ 해시태그 생성 실패: {e}")
+    finally:
+        db.close()
+        progress["elapsed_seconds"] = round(time.monotonic() - started, 1)
+        try:
+            _save_progress(progress)
+        finally:
+            redis_sync_client.delete(HASHTAG_JOB_LOCK_KEY)
+
+    # 진행 상황 저장 / 락 해제 뒤 후처리 - 실패해도 이미 commit된 태그에는 영향 없음
+    if progress.get("place_tags_added") or progress.get("place_tags_removed"):
+        try:
+            invalidate_hashtag_pages()
+            refresh_tag_stats()
+            rebuild_place_features()
+        except Exception as e:
+            print(f"⚠️ 해시태그 후처리 실패: {e}")
+
+    return progress
+
+
+def run_queued_hashtag_job() -> dict | None:
+    """
+    대기열에 장소가 있으면 해시태그 재생성 (증분 동기화 뒤 스케줄러에서 호출)
+    """
+    if not redis_sync_client.scard(HASHTAG_QUEUE_KEY):
+        return None
+    if not try_acquire_hashtag_job():
+        return None
+    return run_hashtag_job(mode="queued")
@@ -0,0 +1,95 @@
+# app/services/map_tiles.py
+import math
+
+from sqlalchemy.orm import Session
+
+from app.services.spatial_index import get_spatial_index
+
+# 이 줌 이상이면 개별 지점, 미만이면 클러스터로 응답
+POINT_ZOOM = 14
+# 클러스터 집계 시 타일을 나누는 칸 수 (CLUSTER_GRID x CLUSTER_GRID)
+CLUSTER_GRID = 8
+MIN_ZOOM = 5
+MAX_ZOOM = 18
+TILE_CACHE_TTL = 60 * 60 * 6
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """
+    XYZ(Web Mercator) 타일 → (south, west, north, east)
+    """
+    n = 2 ** z
+
+    def lat(ty: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    west = x / n * 360.0 - 180.0
+    east = (x + 1) / n * 360.0 - 180.0
+    return lat(y + 1), west, lat(y), east
+
+
+def build_tile(db: Session, z: int, x: int, y: int) -> dict:
+    """
+    타일 하나의 지도 데이터
+    - z < POINT_ZOOM: [lat, lng, count] 클러스터 (1개짜리 칸은 지점으로)
+    - z >= POINT_ZOOM: [contentid, title, lat, lng, contenttypeid] 지점
+    """
+    south, west, north, east = tile_bounds(z, x, y)
+    grid = get_spatial_index(db)
+    points = grid.points_in_bbox(south, west, north, east)
+
+    if z >= POINT_ZOOM:
+        return {
+            "z": z, "x": x, "y": y,
+            "clusters": [],
+            "points": [[p.contentid, p.title, p.mapy, p.mapx, p.contenttypeid] for p in points],
+        }
+
+    cell_h = (north - south) / CLUSTER_GRID
+    cell_w = (east - west) / CLUSTER_GRID
+    buckets: dict[tuple[int, int], list] = {}
+    for p in points:
+        key = (
+            min(int((p.mapy - south) / cell_h), CLUSTER_GRID - 1),
+            min(int((p.mapx - west) / cell_w), CLUSTER_GRID - 1),
+        )
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = [p.mapy, p.mapx, 1, p]
+        else:
+            b[0] += p.mapy
+            b[1] += p.mapx
+            b[2] += 1
+
+    clusters = []
+    singles = []
+    for sum_lat, sum_lng, count, first in buckets.values():
+        if count == 1:
+            singles.append([first.contentid, first.title, first.mapy, first.mapx, first.contenttypeid])
+        else:
+            clusters.append([round(sum_lat / count, 6), round(sum_lng / count, 6), count])
+
+    return {"z": z, "x": x, "y": y, "clusters": clusters, "points": singles}
+
+
+def search_map_points(db: Session, keyword: str, limit: int = 200) -> list[dict]:
+    """
+    지도 검색 - 제목/주소 부분 일치 (메모리 인덱스에서 검색, DB 스캔 없음)
+    """
+    key = keyword.strip().lower()
+    if not key:
+        return []
+
+    results = []
+    for p in get_spatial_index(db).points:
+        if key in p.title.lower() or key in p.addr1.lower():
+            results.append({
+                "contentid": p.contentid,
+                "title": p.title,
+                "addr1": p.addr1,
+                "mapx": p.mapx,
+                "mapy": p.mapy,
+            })
+            if len(results) >= limit:
+                break
+    return results
@@ -0,0 +1,79 @@
+# app/services/page_cache.py
+import hashlib
+import os
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.services.places import PLACES_CATALOG_VERSION
+from app.services.tag_index import HASHTAGS_VERSION, invalidate_tag_index
+from app.utils.redis_client import get_cached, set_cached, get_version, bump_version_sync
+
+# 버전이 바뀌면 새 키를 쓰므로 TTL은 메모리 회수용
+PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", str(60 * 10)))
+
+
+def invalidate_hashtag_pages():
+    """
+    동기 코드(해시태그 생성 등)에서 호출 - 실패해도 TTL 후에는 갱신됨
+    """
+    # 같은 프로세스의 태그 인덱스는 바로 재생성 (다른 워커는 버전 확인으로 재생성)
+    invalidate_tag_index()
+    try:
+        bump_version_sync(HASHTAGS_VERSION)
+    except Exception as e:
+        print(f"⚠️ 페이지 캐시 무효화 실패: {e}")
+
+
+def _normalize_params(params: dict) -> str:
+    """
+    빈 값 제거 + 이름순 정렬 (?page=1&sort= 와 ?sort=&page=1 을 같은 키로)
+    """
+    items = sorted((k, str(v).strip()) for k, v in params.items() if v not in (None, ""))
+    return "&".join(f"{k}={v}" for k, v in items)
+
+
+def _etag(body: str) -> str:
+    return '"' + hashlib.sha1(body.encode()).hexdigest()[:20] + '"'
+
+
+def _page_response(request: Request, body: str, etag: str) -> Response:
+    headers = {
+        "ETag": etag,
+        # 매번 ETag로 재검증 (로그인 사용자 응답과 섞이지 않도록 Authorization 기준 분리)
+        "Cache-Control": "no-cache",
+        "Vary": "Authorization",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+
+async def cached_page(request: Request, params: dict, render: Callable[[], str]) -> Response:
+    """
+    비로그인 사용자용 렌더링 결과 캐시
+    키: 경로 + 정규화된 쿼리 + (카탈로그, 해시태그) 버전
+    캐시에 없으면 render()를 threadpool에서 실행 (DB 조회 + Jinja2 렌더링)
+    """
+    key = None
+    try:
+        catalog_version = await get_version(PLACES_CATALOG_VERSION)
+        hashtags_version = await get_version(HASHTAGS_VERSION)
+        digest = hashlib.sha1(_normalize_params(params).encode()).hexdigest()
+        key = f"page:{request.url.path}:v{catalog_version}.{hashtags_version}:{digest}"
+        entry = await get_cached(key)
+        if entry:
+            return _page_response(request, entry["body"], entry["etag"])
+    except Exception as e:
+        print(f"⚠️ 페이지 캐시 조회 실패: {e}")
+
+    body = await run_in_threadpool(render)
+    etag = _etag(body)
+    if key is not None:
+        try:
+            await set_cached(key, {"body": body, "etag": etag}, expire_seconds=PAGE_CACHE_TTL)
+        except Exception as e:
+            print(f"⚠️ 페이지 캐시 저장 실패: {e}")
+    return _page_response(request, body, etag)
@@ -0,0 +1,97 @@
+# app/services/place_count.py
+import hashlib
+import json
+import os
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from app.models.places import Place
+from app.services.place_search import to_boolean_query
+from app.services.tag_index import HASHTAGS_VERSION
+from app.utils.redis_client import redis_sync_client, get_version_sync
+
+# 카탈로그 버전(태그 조건이 있으면 해시태그 버전도)이 키에 들어가므로 수집/동기화/해시태그 생성 후에는 자동으로 새 키 사용
+# TTL은 버전을 올리지 않는 변경을 위한 상한
+COUNT_CACHE_TTL = int(os.getenv("PLACE_COUNT_CACHE_TTL", str(60 * 10)))
+# 검색어가 있으면 이 개수까지만 세고 "N개 이상"으로 표시 (전체 COUNT 대신)
+SEARCH_COUNT_CAP = int(os.getenv("PLACE_SEARCH_COUNT_CAP", "1000"))
+
+
+def count_signature(contenttypeid: str | None, addr: str | None, search: str | None, tag: str | None) -> str:
+    """
+    필터 조건 → 캐시 키용 서명 (검색어는 실제 검색식 기준으로 정규화)
+    """
+    normalized = {
+        "contenttypeid": contenttypeid if contenttypeid and contenttypeid.isdigit() else None,
+        "addr": addr or None,
+        "search": to_boolean_query(search or ""),
+        "tag": tag or None,
+    }
+    raw = json.dumps(normalized, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _count_key(signature: str, version: int, tag_version: int | None = None) -> str:
+    if tag_version is None:
+        return f"places:count:v{version}:{signature}"
+    return f"places:count:v{version}:h{tag_version}:{signature}"
+
+
+def _count_exact(query: Query) -> int:
+    return query.count()
+
+
+def _count_capped(query: Query, cap: int) -> int:
+    """
+    cap + 1 행까지만 읽는 COUNT (검색 결과가 많아도 비용 고정)
+    """
+    limited = query.with_entities(Place.id).limit(cap + 1).subquery()
+    return query.session.query(func.count()).select_from(limited).scalar() or 0
+
+
+def count_places(
+    query: Query,
+    catalog_version: str,
+    contenttypeid: str | None = None,
+    addr: str | None = None,
+    search: str | None = None,
+    tag: str | None = None,
+) -> tuple[int, bool]:
+    """
+    필터가 적용된 목록 query의 전체 개수 → (개수, 추정치 여부)
+    - Redis에 (필터 서명, 카탈로그 버전, 태그 조건이면 해시태그 버전) 단위로 캐시
+    - 검색어가 있으면 SEARCH_COUNT_CAP까지만 세고 넘으면 추정치로 표시
+    - Redis 장애 시 DB에서 바로 계산
+    """
+    estimated_mode = to_boolean_query(search or "") is not None
+    signature = count_signature(contenttypeid, addr, search, tag)
+
+    key = None
+    try:
+        # 태그 조건은 해시태그 생성 결과에 따라 달라지므로 해시태그 버전도 키에 포함
+        tag_version = get_version_sync(HASHTAGS_VERSION) if tag else None
+        key = _count_key(signature, get_version_sync(catalog_version), tag_version)
+        cached = redis_sync_client.get(key)
+        if cached is not None:
+            total, estimated = json.loads(cached)
+            return int(total), bool(estimated)
+    except Exception as e:
+        print(f"⚠️ 목록 개수 캐시 조회 실패: {e}")
+        key = None
+
+    if estimated_mode:
+        total = _count_capped(query, SEARCH_COUNT_CAP)
+        estimated = total > SEARCH_COUNT_CAP
+        total = min(total, SEARCH_COUNT_CAP)
+    else:
+        total = _count_exact(query)
+        estimated = False
+
+    if key is not None:
+        try:
+            redis_sync_client.set(key, json.dumps([total, estimated]), ex=COUNT_CACHE_TTL)
+        except Exception as e:
+            print(f"⚠️ 목록 개수 캐시 저장 실패: {e}")
+
+    return total, estimated
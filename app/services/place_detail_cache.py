@@ -0,0 +1,209 @@
+# app/services/place_detail_cache.py
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models.places import PlaceDetail, PlaceImage
+from app.services.places import fetch_detail_images_async, fetch_detail_info_async
+from app.utils.redis_client import redis_client, get_cached, set_cached
+
+# 이 시간 안이면 그대로 사용, 지나면 기존 값을 돌려주고 백그라운드에서 갱신 (stale-while-revalidate)
+DETAIL_FRESH_SECONDS = int(os.getenv("PLACE_DETAIL_FRESH_SECONDS", str(60 * 60 * 6)))
+# Redis 보관 기간 (stale 값 포함)
+DETAIL_CACHE_TTL = int(os.getenv("PLACE_DETAIL_CACHE_TTL", str(60 * 60 * 24 * 7)))
+# 빈 결과(이미지 없음 / API 오류)는 짧게만 신뢰
+EMPTY_FRESH_SECONDS = 60 * 10
+REFRESH_LOCK_TTL = 60
+# TourAPI 호출 1회당 타임아웃 (초)
+UPSTREAM_TIMEOUT = float(os.getenv("PLACE_DETAIL_UPSTREAM_TIMEOUT", "5"))
+
+# 백그라운드 갱신 task 참조 유지 (GC 방지)
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _images_key(contentid: str) -> str:
+    return f"place:detail_images:{contentid}"
+
+
+def _info_key(contentid: str, contenttypeid: str) -> str:
+    return f"place:detail_info:{contentid}:{contenttypeid}"
+
+
+def _is_fresh(entry: dict) -> bool:
+    fresh_seconds = DETAIL_FRESH_SECONDS if entry.get("data") else EMPTY_FRESH_SECONDS
+    return time.time() - entry.get("fetched_at", 0) < fresh_seconds
+
+
+async def _redis_get(key: str) -> dict | None:
+    try:
+        return await get_cached(key)
+    except Exception as e:
+        print(f"⚠️ Redis 조회 실패 {key}: {e}")
+        return None
+
+
+async def _redis_set(key: str, entry: dict):
+    try:
+        await set_cached(key, entry, expire_seconds=DETAIL_CACHE_TTL)
+    except Exception as e:
+        print(f"⚠️ Redis 저장 실패 {key}: {e}")
+
+
+# ------------------------------------------
+# DB fallback (PlaceDetail.detail_json / PlaceImage)
+# ------------------------------------------
+def _load_images_from_db(place_id: int) -> dict | None:
+    db = SessionLocal()
+    try:
+        detail = db.query(PlaceDetail).filter(PlaceDetail.place_id == place_id).first()
+        fetched_at = (detail.detail_json or {}).get("images_fetched_at") if detail else None
+        if not fetched_at:
+            return None
+        images = db.query(PlaceImage).filter(PlaceImage.place_id == place_id).order_by(PlaceImage.id).all()
+        data = [{"originimgurl": img.image_url, "smallimageurl": img.thumbnail_url} for img in images]
+        return {"data": data, "fetched_at": fetched_at}
+    finally:
+        db.close()
+
+
+def _load_info_from_db(place_id: int, contenttypeid: str) -> dict | None:
+    db = SessionLocal()
+    try:
+        detail = db.query(PlaceDetail).filter(PlaceDetail.place_id == place_id).first()
+        detail_json = (detail.detail_json or {}) if detail else {}
+        if "info_fetched_at" not in detail_json or detail_json.get("info_contenttypeid") != contenttypeid:
+            return None
+        return {"data": detail_json.get("detail_info"), "fetched_at": detail_json["info_fetched_at"]}
+    finally:
+        db.close()
+
+
+# 장소당 1행을 upsert 하면서 detail_json의 지정한 키만 변경
+# (이미지/소개 저장이 동시에 실행돼도 서로의 키를 덮어쓰지 않음)
+_UPSERT_DETAIL_JSON = """
+INSERT INTO place_details (place_id, detail_json)
+VALUES (:place_id, CAST(:patch AS JSON))
+ON DUPLICATE KEY UPDATE detail_json = JSON_MERGE_PATCH(COALESCE(detail_json, JSON_OBJECT()), CAST(:patch AS JSON))
+"""
+
+
+def _patch_detail_json(db, place_id: int, patch: dict):
+    db.execute(
+        text(_UPSERT_DETAIL_JSON),
+        {"place_id": place_id, "patch": json.dumps(patch, ensure_ascii=False)},
+    )
+
+
+def _save_images_to_db(place_id: int, entry: dict):
+    db = SessionLocal()
+    try:
+        db.query(PlaceImage).filter(PlaceImage.place_id == place_id).delete(synchronize_session=False)
+        db.add_all([
+            PlaceImage(place_id=place_id, image_url=img["originimgurl"], thumbnail_url=img.get("smallimageurl"))
+            for img in entry["data"]
+        ])
+        _patch_detail_json(db, place_id, {"images_fetched_at": entry["fetched_at"]})
+        db.commit()
+    finally:
+        db.close()
+
+
+def _save_info_to_db(place_id: int, contenttypeid: str, entry: dict):
+    db = SessionLocal()
+    try:
+        _patch_detail_json(db, place_id, {
+            "detail_info": entry["data"],
+            "info_contenttypeid": contenttypeid,
+            "info_fetched_at": entry["fetched_at"],
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+# ------------------------------------------
+# read-through + stale-while-revalidate
+# ------------------------------------------
+async def _fetch_and_store(
+    key: str,
+    fetcher: Callable[[], Awaitable],
+    db_saver: Callable[[dict], None],
+) -> dict:
+    data = await fetcher()
+    entry = {"data": data, "fetched_at": time.time()}
+    # API 오류(None)는 저장하지 않음
+    if data is not None:
+        await _redis_set(key, entry)
+        try:
+            await asyncio.to_thread(db_saver, entry)
+        except Exception as e:
+            print(f"⚠️ 상세 캐시 DB 저장 실패 {key}: {e}")
+    return entry
+
+
+async def _refresh_in_background(key, fetcher, db_saver):
+    try:
+        # 같은 키를 여러 요청/워커가 동시에 갱신하지 않도록
+        if not await redis_client.set(f"{key}:refresh", "1", nx=True, ex=REFRESH_LOCK_TTL):
+            return
+    except Exception:
+        pass
+    try:
+        await _fetch_and_store(key, fetcher, db_saver)
+    except Exception as e:
+        print(f"⚠️ 상세 캐시 백그라운드 갱신 실패 {key}: {e}")
+
+
+def _schedule_refresh(key, fetcher, db_saver):
+    task = asyncio.create_task(_refresh_in_background(key, fetcher, db_saver))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _read_through(key, db_loader, fetcher, db_saver):
+    """
+    Redis → DB → TourAPI 순서로 조회
+    오래된(stale) 값은 즉시 반환하고 갱신은 백그라운드에서 수행
+    """
+    entry = await _redis_get(key)
+    if entry is None:
+        entry = await asyncio.to_thread(db_loader)
+        if entry is not None:
+            await _redis_set(key, entry)
+
+    if entry is None:
+        entry = await _fetch_and_store(key, fetcher, db_saver)
+    elif not _is_fresh(entry):
+        _schedule_refresh(key, fetcher, db_saver)
+
+    return entry["data"]
+
+
+async def get_detail_images_cached(place_id: int, contentid: str) -> list:
+    """
+    detailImage2 결과 캐시 조회 (없으면 TourAPI 호출)
+    """
+    images = await _read_through(
+        _images_key(contentid),
+        lambda: _load_images_from_db(place_id),
+        lambda: fetch_detail_images_async(contentid, timeout=UPSTREAM_TIMEOUT),
+        lambda entry: _save_images_to_db(place_id, entry),
+    )
+    return images or []
+
+
+async def get_detail_info_cached(place_id: int, contentid: str, contenttypeid: str):
+    """
+    detailIntro2 결과 캐시 조회 (없으면 TourAPI 호출)
+    """
+    return await _read_through(
+        _info_key(contentid, contenttypeid),
+        lambda: _load_info_from_db(place_id, contenttypeid),
+        lambda: fetch_detail_info_async(contentid, contenttypeid, timeout=UPSTREAM_TIMEOUT),
+        lambda entry: _save_info_to_db(place_id, contenttypeid, entry),
+    )
@@ -0,0 +1,124 @@
+# app/services/place_export.py
+import json
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import func
+
+from app.database import SessionLocal
+from app.models.places import Place
+from app.services.places import PLACES_CATALOG_VERSION
+from app.utils.redis_client import redis_sync_client, get_version_sync
+
+# 내보내기 가능한 컬럼 (fields=로 선택)
+EXPORT_FIELDS = [
+    "id", "contentid", "contenttypeid", "title", "addr1", "addr2",
+    "areacode", "sigungucode", "mapx", "mapy", "cat1", "cat2", "cat3",
+    "firstimage", "firstimage2", "overview", "homepage", "tel", "zipcode",
+    "created_at", "updated_at", "synced_at",
+]
+DEFAULT_EXPORT_FIELDS = ["id", "contentid", "title", "addr1", "overview"]
+# 서버 측 커서에서 한 번에 가져오는 행 수 (메모리 사용량 상한)
+EXPORT_BATCH_SIZE = 500
+EXPORT_MAX_LIMIT = 50000
+# 응답 조각 하나에 담는 행 수
+EXPORT_CHUNK_ROWS = 100
+# 버전이 바뀌면 새 키를 쓰므로 TTL은 오래된 키 정리용
+LAST_MODIFIED_TTL = 60 * 60 * 24
+
+
+def parse_export_fields(fields: str | None) -> list[str]:
+    """
+    "contentid,title" → 컬럼 목록 (id는 커서로 쓰이므로 항상 포함)
+    알 수 없는 컬럼이면 ValueError
+    """
+    if not fields:
+        return list(DEFAULT_EXPORT_FIELDS)
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 필드: {', '.join(unknown)}")
+    if "id" not in selected:
+        selected.insert(0, "id")
+    return list(dict.fromkeys(selected))
+
+
+def get_catalog_last_modified() -> datetime | None:
+    """
+    마지막으로 바뀐 장소의 synced_at (UTC)
+    관광지 데이터 버전별로 Redis에 캐시 → 요청마다 MAX() 쿼리를 실행하지 않음
+    """
+    try:
+        key = f"places:export:last_modified:v{get_version_sync(PLACES_CATALOG_VERSION)}"
+        cached = redis_sync_client.get(key)
+    except Exception:
+        key, cached = None, None
+    if cached:
+        return datetime.fromisoformat(cached)
+
+    db = SessionLocal()
+    try:
+        last_modified = db.query(func.max(Place.synced_at)).scalar()
+    finally:
+        db.close()
+    if key and last_modified is not None:
+        try:
+            redis_sync_client.set(key, last_modified.isoformat(), ex=LAST_MODIFIED_TTL)
+        except Exception:
+            pass
+    return last_modified
+
+
+def _to_json(row: dict) -> str:
+    return json.dumps(row, ensure_ascii=False, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+
+def iter_place_export(
+    fields: list[str],
+    after_id: int = 0,
+    synced_since: datetime | None = None,
+    limit: int = 1000,
+    fmt: str = "json",
+) -> Iterator[str]:
+    """
+    id 오름차순으로 Place를 스트리밍 (stream_results + yield_per)
+    - fmt="ndjson": 한 줄에 한 건
+    - fmt="json": JSON 배열을 조각 단위로 출력
+    다음 페이지는 마지막 항목의 id를 after_id로 넘겨서 조회
+    응답이 끝날 때까지 세션을 유지해야 하므로 요청 세션 대신 별도 세션 사용
+    """
+    db = SessionLocal()
+    try:
+        columns = [getattr(Place, f) for f in fields]
+        query = db.query(*columns).filter(Place.id > after_id)
+        if synced_since is not None:
+            query = query.filter(Place.synced_at > synced_since)
+        rows = (
+            query.order_by(Place.id.asc())
+            .limit(limit)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        # 행마다 write하지 않도록 묶어서 출력
+        chunk: list[str] = []
+        if fmt == "ndjson":
+            for row in rows:
+                chunk.append(_to_json(dict(zip(fields, row))) + "\n")
+                if len(chunk) >= EXPORT_CHUNK_ROWS:
+                    yield "".join(chunk)
+                    chunk = []
+            if chunk:
+                yield "".join(chunk)
+            return
+
+        yield "["
+        first = True
+        for row in rows:
+            chunk.append(("" if first else ",\n") + _to_json(dict(zip(fields, row))))
+            first = False
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield "".join(chunk)
+                chunk = []
+        yield "".join(chunk) + "]\n"
+    finally:
+        db.close()
@@ -0,0 +1,287 @@
+# app/services/place_features.py
+import os
+import threading
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.hashtag import Tag, PlaceTag
+from app.models.places import Place, PlaceFeature
+from app.utils.redis_client import redis_sync_client, get_version_sync, bump_version_sync
+
+# ------------------------------------------
+# 키워드 사전 (비트 위치 = 목록 순서)
+# ------------------------------------------
+AREA_WORDS = ["산", "바다", "도시", "자연"]
+ACTIVITY_WORDS = ["맛집", "문화", "축제", "카페", "체험", "레포츠"]
+COMPANION_WORDS = ["혼자", "친구", "가족", "커플", "연인", "단체", "어린이"]
+# 동행자 점수는 해시태그 전체와 비교 - 추천에 쓰이는 키워드는 모두 비트로 보관
+TAG_WORDS = COMPANION_WORDS + AREA_WORDS + ACTIVITY_WORDS
+
+OPPOSITE_KEYWORDS = {
+    "산": "바다",
+    "바다": "산",
+    "도시": "자연",
+    "자연": "도시",
+}
+# 선호 없음으로 취급하는 값
+NEUTRAL_VALUES = {"알 수 없음", "보통"}
+
+FEATURES_VERSION = "place_features"
+FEATURES_LOCK_KEY = "places:features:lock"
+# 워커별 특징 행렬 재로딩 주기 (초) - 버전이 바뀌면 그 전에도 재로딩
+FEATURES_TTL = int(os.getenv("PLACE_FEATURES_TTL", "3600"))
+VERSION_CHECK_INTERVAL = 10
+INSERT_CHUNK = 2000
+
+
+def _bits(words: list[str]) -> dict[str, int]:
+    return {word: 1 << i for i, word in enumerate(words)}
+
+
+TAG_BITS = _bits(TAG_WORDS)
+AREA_BITS = _bits(AREA_WORDS)
+ACTIVITY_BITS = _bits(ACTIVITY_WORDS)
+
+
+def encode_mask(values, bits: dict[str, int]) -> int:
+    mask = 0
+    for value in values:
+        mask |= bits.get(value, 0)
+    return mask
+
+
+def place_keywords(addr1: str | None, contenttypeid: int | None, tags: list[str]) -> dict:
+    """
+    장소 → 추천 비교용 키워드 (tags / area / activity / vibe)
+    """
+    area_keywords: list[str] = []
+    if addr1:
+        if "산" in addr1:
+            area_keywords.append("산")
+        if "해수욕장" in addr1 or "해변" in addr1 or "바다" in addr1:
+            area_keywords.append("바다")
+        if any(word in addr1 for word in ["도심", "역", "광장"]):
+            area_keywords.append("도시")
+
+    # 활동 타입 예시: 음식점 / 카페 / 박물관 / 축제 등
+    activity_keywords: list[str] = []
+    if contenttypeid == 39:
+        activity_keywords.append("맛집")
+    if contenttypeid == 14:
+        activity_keywords.append("문화")
+    if contenttypeid == 15:
+        activity_keywords.append("축제")
+
+    # 해시태그도 영역/활동에 섞기
+    for t in tags:
+        if t in {"산", "바다", "도시", "자연"}:
+            area_keywords.append(t)
+        if t in {"맛집", "카페", "체험", "축제", "레포츠"}:
+            activity_keywords.append(t)
+
+    # 상황/거리: 예시는 '멀리 가기 싫음/상관 없음/당일치기' 등 선호와 비교할 것
+    vibe_keywords: list[str] = []
+
+    return {
+        "tags": tags,
+        "area": area_keywords,
+        "activity": activity_keywords,
+        "vibe": vibe_keywords,
+    }
+
+
+# ------------------------------------------
+# place_features 재계산
+# ------------------------------------------
+def rebuild_place_features() -> int | None:
+    """
+    모든 장소의 특징 비트마스크를 다시 계산해 place_features 교체 (한 트랜잭션)
+    """
+    count = _rebuild_place_features()
+    if count is not None:
+        # 새 특징으로 선호도 조합별 추천 순위 다시 계산 (특징 락은 이미 해제된 뒤)
+        from app.services.recommend_precompute import precompute_recommendations
+        precompute_recommendations()
+    return count
+
+
+def _rebuild_place_features() -> int | None:
+    acquired = False
+    db = None
+    started = time.monotonic()
+    try:
+        acquired = bool(redis_sync_client.set(FEATURES_LOCK_KEY, "1", nx=True, ex=60 * 10))
+        if not acquired:
+            return None
+
+        db = SessionLocal()
+        tags_by_place: dict[int, list[str]] = {}
+        for place_id, name in db.query(PlaceTag.place_id, Tag.name).join(Tag, Tag.id == PlaceTag.tag_id):
+            tags_by_place.setdefault(place_id, []).append(name)
+
+        rows = []
+        for p in db.query(Place.id, Place.contentid, Place.contenttypeid, Place.areacode, Place.addr1):
+            pk = place_keywords(p.addr1, p.contenttypeid, tags_by_place.get(p.id, []))
+            rows.append({
+                "place_id": p.id,
+                "contentid": p.contentid,
+                "contenttypeid": p.contenttypeid,
+                "areacode": p.areacode,
+                "region": (p.addr1 or "")[:2],
+                "tag_mask": encode_mask(pk["tags"], TAG_BITS),
+                "area_mask": encode_mask(pk["area"], AREA_BITS),
+                "activity_mask": encode_mask(pk["activity"], ACTIVITY_BITS),
+            })
+
+        db.query(PlaceFeature).delete(synchronize_session=False)
+        for i in range(0, len(rows), INSERT_CHUNK):
+            db.execute(PlaceFeature.__table__.insert(), rows[i:i + INSERT_CHUNK])
+        db.commit()
+        bump_version_sync(FEATURES_VERSION)
+        invalidate_feature_matrix()
+        print(f"🧮 장소 특징 갱신: {len(rows)}개 ({time.monotonic() - started:.1f}s)")
+        return len(rows)
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        print(f"❌ 장소 특징 갱신 실패: {e}")
+        return None
+    finally:
+        if db is not None:
+            db.close()
+        if acquired:
+            redis_sync_client.delete(FEATURES_LOCK_KEY)
+
+
+def rebuild_place_features_if_empty():
+    db = SessionLocal()
+    try:
+        empty = db.query(PlaceFeature.place_id).first() is None
+    finally:
+        db.close()
+    if empty:
+        rebuild_place_features()
+
+
+# ------------------------------------------
+# 특징 행렬 (워커별 메모리, place_id 오름차순)
+# ------------------------------------------
+class FeatureMatrix:
+    def __init__(self, rows: list, version: int):
+        rows = sorted(rows, key=lambda r: r.place_id)
+        self.place_ids = np.array([r.place_id for r in rows], dtype=np.int64)
+        self.contentids = [r.contentid for r in rows]
+        self.contenttypeids = np.array([r.contenttypeid for r in rows], dtype=np.int32)
+        self.areacodes = np.array([r.areacode or "" for r in rows], dtype=object)
+        self.regions = np.array([r.region or "" for r in rows], dtype=object)
+        self.tag_mask = np.array([r.tag_mask for r in rows], dtype=np.uint32)
+        self.area_mask = np.array([r.area_mask for r in rows], dtype=np.uint32)
+        self.activity_mask = np.array([r.activity_mask for r in rows], dtype=np.uint32)
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.checked_at = self.loaded_at
+
+    def __len__(self) -> int:
+        return len(self.place_ids)
+
+    def positions(self, place_ids: list[int]) -> np.ndarray:
+        """
+        place_id → 행 위치 (없으면 -1)
+        """
+        ids = np.asarray(place_ids, dtype=np.int64)
+        if not len(self.place_ids):
+            return np.full(len(ids), -1)
+        pos = np.minimum(np.searchsorted(self.place_ids, ids), len(self.place_ids) - 1)
+        return np.where(self.place_ids[pos] == ids, pos, -1)
+
+
+def _match_scores(user_value, mask: np.ndarray, bits: dict[str, int]) -> np.ndarray:
+    """
+    three_level_match 벡터 버전 (mask: 장소별 키워드 비트)
+    - 선호 없음 / 장소 키워드 없음 → 0.5, 일치 → 1.0, 반대 키워드 → 0.0, 그 외 0.5
+    - 리스트면 값별 점수의 최댓값
+    사전(bits)에 없는 값은 일치 여부를 알 수 없으므로 0.5
+    """
+    if isinstance(user_value, (list, tuple, set)):
+        if not user_value:
+            return np.full(len(mask), 0.5)
+        return np.maximum.reduce([_match_scores(v, mask, bits) for v in user_value])
+
+    if not user_value or user_value in NEUTRAL_VALUES:
+        return np.full(len(mask), 0.5)
+
+    scores = np.full(len(mask), 0.5)
+    opp_bit = bits.get(OPPOSITE_KEYWORDS.get(user_value), 0)
+    if opp_bit:
+        scores[(mask & opp_bit) != 0] = 0.0
+    bit = bits.get(user_value, 0)
+    if bit:
+        scores[(mask & bit) != 0] = 1.0
+    return scores
+
+
+def score_features(matrix: FeatureMatrix, prefs: dict, rows: np.ndarray | slice = slice(None)) -> dict:
+    """
+    score_place_by_preferences와 같은 가중치로 여러 장소를 한 번에 점수 계산
+    반환: {"base", "topic", "distance", "total"} → 각각 rows 순서의 배열
+    """
+    tag_mask = matrix.tag_mask[rows]
+    base = _match_scores(prefs.get("companion"), tag_mask, TAG_BITS)
+    area = _match_scores(prefs.get("area_theme"), matrix.area_mask[rows], AREA_BITS)
+    activity = _match_scores(prefs.get("activity_type"), matrix.activity_mask[rows], ACTIVITY_BITS)
+    # 장소 쪽 상황(vibe) 키워드가 아직 없으므로 항상 0.5
+    distance = np.full(len(tag_mask), 0.5)
+    topic = (area + activity) / 2
+
+    return {
+        "base": base,
+        "topic": topic,
+        "distance": distance,
+        "total": base * 0.2 + topic * 0.5 + distance * 0.3,
+    }
+
+
+_matrix: FeatureMatrix | None = None
+_matrix_lock = threading.Lock()
+
+
+def _current_version() -> int:
+    try:
+        return get_version_sync(FEATURES_VERSION)
+    except Exception:
+        return -1
+
+
+def _load_matrix(db: Session, version: int) -> FeatureMatrix:
+    rows = db.query(
+        PlaceFeature.place_id, PlaceFeature.contentid, PlaceFeature.contenttypeid,
+        PlaceFeature.areacode, PlaceFeature.region,
+        PlaceFeature.tag_mask, PlaceFeature.area_mask, PlaceFeature.activity_mask,
+    ).all()
+    return FeatureMatrix(rows, version)
+
+
+def get_feature_matrix(db: Session) -> FeatureMatrix:
+    global _matrix
+    matrix = _matrix
+    now = time.monotonic()
+    if matrix is not None and now - matrix.loaded_at < FEATURES_TTL:
+        if now - matrix.checked_at < VERSION_CHECK_INTERVAL:
+            return matrix
+        matrix.checked_at = now
+        if _current_version() == matrix.version:
+            return matrix
+
+    with _matrix_lock:
+        if _matrix is None or _matrix is matrix:
+            _matrix = _load_matrix(db, _current_version())
+            print(f"🧮 장소 특징 행렬 로딩: {len(_matrix)}개")
+        return _matrix
+
+
+def invalidate_feature_matrix():
+    global _matrix
+    _matrix = None
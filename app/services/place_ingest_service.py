@@ -0,0 +1,364 @@
+# app/services/place_ingest_service.py
+import asyncio
+import math
+import os
+import time
+from datetime import datetime
+
+from app.database import SessionLocal
+from app.models.places import Place, PlaceSyncState
+from app.services.places import (
+    MAX_SAVE_COUNT,
+    PLACES_CATALOG_VERSION,
+    build_place_row,
+    fetch_place_detail_async,
+    fetch_tour_data_async,
+    upsert_places,
+)
+from app.services.spatial_index import invalidate_spatial_index
+from app.services.hashtag_engine import enqueue_hashtag_places
+from app.services.place_features import rebuild_place_features
+from app.utils.redis_client import redis_client, get_cached, set_cached, delete_cached, bump_version
+
+# 동시에 가져올 목록 페이지 수 / 동시에 진행할 상세 요청 수
+PAGE_CONCURRENCY = int(os.getenv("INGEST_PAGE_CONCURRENCY", "4"))
+DETAIL_CONCURRENCY = int(os.getenv("INGEST_DETAIL_CONCURRENCY", "16"))
+
+INGEST_LOCK_KEY = "places:ingest:lock"
+INGEST_CURSOR_KEY = "places:ingest:last_page"
+INGEST_PROGRESS_KEY = "places:ingest:progress"
+INGEST_LOCK_TTL = 60 * 60 * 3
+SYNC_PROGRESS_KEY = "places:sync:progress"
+
+# TourAPI 관광타입 (관광지/문화시설/축제/여행코스/레포츠/숙박/쇼핑/음식점)
+TOUR_CONTENT_TYPE_IDS = [12, 14, 15, 25, 28, 32, 38, 39]
+SYNC_NUM_OF_ROWS = 100
+
+
+# ------------------------------------------
+# 진행 상황 / 재개 지점 (Redis)
+# ------------------------------------------
+async def get_ingest_progress() -> dict | None:
+    return await get_cached(INGEST_PROGRESS_KEY)
+
+
+async def _save_progress(progress: dict):
+    progress["updated_at"] = int(time.time())
+    await set_cached(INGEST_PROGRESS_KEY, progress, expire_seconds=60 * 60 * 24 * 7)
+
+
+async def is_ingestion_running() -> bool:
+    return bool(await redis_client.exists(INGEST_LOCK_KEY))
+
+
+async def _on_catalog_changed():
+    """
+    관광지 데이터가 바뀐 뒤 캐시 무효화
+    실패해도 수집 결과에는 영향 없음 (다음 갱신 때 다시 시도)
+    """
+    try:
+        invalidate_spatial_index()
+        await bump_version(PLACES_CATALOG_VERSION)
+        await asyncio.to_thread(rebuild_place_features)
+    except Exception as e:
+        print(f"⚠️ 관광지 변경 후처리 실패: {e}")
+
+
+# ------------------------------------------
+# DB 작업 (스레드에서 실행)
+# ------------------------------------------
+def _load_known_contentids() -> set[str]:
+    db = SessionLocal()
+    try:
+        return {row[0] for row in db.query(Place.contentid).all()}
+    finally:
+        db.close()
+
+
+def _enqueue_for_hashtags(rows: list[dict]):
+    # 실제로 내용이 바뀌었는지는 해시태그 작업에서 지문으로 확인
+    try:
+        enqueue_hashtag_places([row["contentid"] for row in rows])
+    except Exception as e:
+        print(f"⚠️ 해시태그 대기열 추가 실패: {e}")
+
+
+def _write_places(rows: list[dict]):
+    db = SessionLocal()
+    try:
+        upsert_places(db, rows)
+        db.commit()
+    finally:
+        db.close()
+    _enqueue_for_hashtags(rows)
+
+
+# ------------------------------------------
+# 페이지 단위 수집
+# ------------------------------------------
+async def _fetch_detail(contentid: str, detail_sem: asyncio.Semaphore) -> dict:
+    async with detail_sem:
+        try:
+            return await fetch_place_detail_async(contentid)
+        except Exception as e:
+            # 상세정보 실패는 목록 정보만으로 저장
+            print(f"⚠️ detailCommon2 실패 contentid={contentid}: {e}")
+            return {}
+
+
+async def _fetch_page_rows(
+    page: int, num_of_rows: int, known: set[str], detail_sem: asyncio.Semaphore
+) -> list[dict]:
+    """
+    목록 한 페이지 → Place row 목록
+    상세(detailCommon2)는 신규 contentid만 요청, 기존 장소는 목록 정보로 갱신
+    """
+    items, _ = await fetch_tour_data_async(page, num_of_rows=num_of_rows)
+    unique_items = {str(item["contentid"]): item for item in items}
+    new_ids = [cid for cid in unique_items if cid not in known]
+
+    details = await asyncio.gather(*(_fetch_detail(cid, detail_sem) for cid in new_ids))
+    detail_map = dict(zip(new_ids, details))
+    return [build_place_row(item, detail_map.get(cid)) for cid, item in unique_items.items()]
+
+
+# ------------------------------------------
+# 병렬 수집 엔진
+# ------------------------------------------
+async def run_place_ingestion(num_of_rows: int = 100, max_pages: int = 1000, resume: bool = True) -> dict:
+    """
+    areaBasedList2 목록 페이지와 detailCommon2 상세를 병렬 수집해 DB에 저장
+    - 목록은 PAGE_CONCURRENCY 페이지씩, 상세는 DETAIL_CONCURRENCY 개씩 동시 요청
+    - 페이지는 순서대로 commit 하고 마지막 commit 페이지를 Redis에 기록 → 실패 시 그 다음 페이지부터 재개
+    """
+    acquired = await redis_client.set(INGEST_LOCK_KEY, "1", nx=True, ex=INGEST_LOCK_TTL)
+    if not acquired:
+        print("⚠️ 이미 TourAPI 수집 작업이 진행 중 → 종료")
+        return {"status": "already_running"}
+
+    started = time.monotonic()
+    progress: dict = {"status": "running"}
+    try:
+        last_committed = int(await get_cached(INGEST_CURSOR_KEY) or 0) if resume else 0
+        known = await asyncio.to_thread(_load_known_contentids)
+        saved_count = len(known)
+
+        _, total_count = await fetch_tour_data_async(1, num_of_rows=1)
+        last_page = min(max_pages, math.ceil(total_count / num_of_rows))
+
+        progress.update({
+            "total_count": total_count,
+            "last_page": last_page,
+            "committed_page": last_committed,
+            "saved_count": saved_count,
+            "inserted": 0,
+            "refreshed": 0,
+        })
+        await _save_progress(progress)
+        print(f"현재 DB 저장 개수: {saved_count}개, {last_committed + 1} ~ {last_page} 페이지 수집 시작")
+
+        detail_sem = asyncio.Semaphore(DETAIL_CONCURRENCY)
+        page = last_committed + 1
+        while page <= last_page:
+            window = list(range(page, min(page + PAGE_CONCURRENCY, last_page + 1)))
+            results = await asyncio.gather(
+                *(_fetch_page_rows(p, num_of_rows, known, detail_sem) for p in window),
+                return_exceptions=True,
+            )
+
+            # 페이지 순서대로 commit (중간 실패 시 그 이전까지만 재개 지점으로 기록)
+            for p, rows in zip(window, results):
+                if isinstance(rows, Exception):
+                    raise rows
+
+                # 기존 장소는 갱신, 신규 장소는 최대 저장 개수까지만 추가
+                existing_rows = [r for r in rows if r["contentid"] in known]
+                new_rows = [r for r in rows if r["contentid"] not in known]
+                new_rows = new_rows[: max(0, MAX_SAVE_COUNT - saved_count)]
+                if existing_rows or new_rows:
+                    await asyncio.to_thread(_write_places, existing_rows + new_rows)
+                    known.update(r["contentid"] for r in new_rows)
+                    saved_count += len(new_rows)
+                    progress["inserted"] += len(new_rows)
+                    progress["refreshed"] += len(existing_rows)
+
+                await set_cached(INGEST_CURSOR_KEY, p, expire_seconds=60 * 60 * 24 * 7)
+                progress.update({"committed_page": p, "saved_count": saved_count})
+                await _save_progress(progress)
+                print(f"📄 {p}/{last_page} 페이지 저장 완료 (총 {saved_count}개)")
+
+            page = window[-1] + 1
+
+        # 끝까지 수집했으면 재개 지점 초기화
+        await delete_cached(INGEST_CURSOR_KEY)
+        progress["status"] = "done"
+        print(f"🎉 최종 저장 개수: {saved_count}개 ({time.monotonic() - started:.1f}초)")
+    except Exception as e:
+        progress.update({"status": "failed", "error": str(e)})
+        print(f"❌ TourAPI 수집 실패 (다음 실행 시 {progress.get('committed_page', 0) + 1} 페이지부터 재개): {e}")
+    finally:
+        progress["elapsed_seconds"] = round(time.monotonic() - started, 1)
+        try:
+            await _save_progress(progress)
+        finally:
+            await redis_client.delete(INGEST_LOCK_KEY)
+
+    # 중간에 실패해도 이미 commit된 페이지가 있으면 캐시 무효화 (진행 상황 저장 / 락 해제 뒤)
+    if progress.get("inserted") or progress.get("refreshed"):
+        await _on_catalog_changed()
+
+    return progress
+
+
+# ------------------------------------------
+# 증분 동기화 (modifiedtime high-water mark)
+# ------------------------------------------
+def _load_sync_state() -> dict[int, str | None]:
+    db = SessionLocal()
+    try:
+        return {row.contenttypeid: row.last_modifiedtime for row in db.query(PlaceSyncState).all()}
+    finally:
+        db.close()
+
+
+def _write_sync_page(contenttypeid: int, rows: list[dict], last_modifiedtime: str | None):
+    """
+    변경분 upsert + 관광타입 high-water mark 갱신을 한 트랜잭션으로 commit
+    """
+    db = SessionLocal()
+    try:
+        upsert_places(db, rows)
+        if last_modifiedtime:
+            state = db.get(PlaceSyncState, contenttypeid)
+            if state is None:
+                state = PlaceSyncState(contenttypeid=contenttypeid)
+                db.add(state)
+            state.last_modifiedtime = last_modifiedtime
+        db.commit()
+    finally:
+        db.close()
+    _enqueue_for_hashtags(rows)
+
+
+def _parse_modifiedtime(value: str) -> datetime | None:
+    try:
+        return datetime.strptime(value, "%Y%m%d%H%M%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def _filter_sync_items(changed: dict[str, dict]) -> dict[str, dict]:
+    """
+    가져온 변경분 중 실제로 저장할 것만
+    - 이미 같은 modifiedtime으로 반영된 장소는 제외 (watermark와 같은 초의 항목은 매번 다시 읽으므로)
+    - 신규 장소는 전체 수집과 같이 MAX_SAVE_COUNT까지만 추가 (수정일 최신순으로 우선)
+    """
+    if not changed:
+        return changed
+    db = SessionLocal()
+    try:
+        stored = dict(
+            db.query(Place.contentid, Place.updated_at).filter(Place.contentid.in_(list(changed))).all()
+        )
+        saved_count = db.query(Place.id).count()
+    finally:
+        db.close()
+
+    room = max(0, MAX_SAVE_COUNT - saved_count)
+    picked: dict[str, dict] = {}
+    for cid, item in changed.items():
+        if cid in stored:
+            if stored[cid] == _parse_modifiedtime(item.get("modifiedtime")):
+                continue
+        elif room:
+            room -= 1
+        else:
+            continue
+        picked[cid] = item
+    return picked
+
+
+async def _sync_content_type(contenttypeid: int, watermark: str | None, detail_sem: asyncio.Semaphore) -> int:
+    """
+    수정일순(arrange=C) 목록을 앞에서부터 읽다가 watermark보다 오래된 항목이 나오면 중단
+    (watermark와 같은 초에 수정된 항목은 지난 실행 이후에 추가됐을 수 있으므로 다시 확인)
+    watermark가 없으면(최초 실행) 현재 최신 modifiedtime만 기록 → 다음 실행부터 증분
+    """
+    changed: dict[str, dict] = {}
+    newest = watermark
+    page = 1
+    while True:
+        items, total_count = await fetch_tour_data_async(
+            page, num_of_rows=SYNC_NUM_OF_ROWS, contenttypeid=contenttypeid
+        )
+        reached_watermark = False
+        for item in items:
+            modified = str(item.get("modifiedtime") or "")
+            if newest is None or modified > newest:
+                newest = modified
+            if watermark is None or modified < watermark:
+                reached_watermark = True
+                break
+            changed.setdefault(str(item["contentid"]), item)
+
+        if reached_watermark or not items or page * SYNC_NUM_OF_ROWS >= total_count:
+            break
+        page += 1
+
+    changed = await asyncio.to_thread(_filter_sync_items, changed)
+
+    if changed:
+        contentids = list(changed)
+        details = await asyncio.gather(*(_fetch_detail(cid, detail_sem) for cid in contentids))
+        rows = []
+        for cid, detail in zip(contentids, details):
+            row = build_place_row(changed[cid], detail or None)
+            row["updated_at"] = _parse_modifiedtime(changed[cid].get("modifiedtime")) or datetime.now()
+            rows.append(row)
+        await asyncio.to_thread(_write_sync_page, contenttypeid, rows, newest)
+    elif newest != watermark:
+        await asyncio.to_thread(_write_sync_page, contenttypeid, [], newest)
+
+    print(f"🔄 contentTypeId={contenttypeid} 변경 {len(changed)}건 반영 (기준 {watermark} → {newest})")
+    return len(changed)
+
+
+async def get_sync_progress() -> dict | None:
+    return await get_cached(SYNC_PROGRESS_KEY)
+
+
+async def run_place_delta_sync() -> dict:
+    """
+    관광타입별 modifiedtime 이후 변경분만 가져와 Place를 갱신 (스케줄러/백그라운드용)
+    전체 수집과 같은 락을 사용해 동시에 실행되지 않도록 함
+    """
+    acquired = await redis_client.set(INGEST_LOCK_KEY, "sync", nx=True, ex=INGEST_LOCK_TTL)
+    if not acquired:
+        print("⚠️ TourAPI 수집/동기화 작업이 진행 중 → 증분 동기화 건너뜀")
+        return {"status": "already_running"}
+
+    started = time.monotonic()
+    progress: dict = {"status": "running", "changed": {}}
+    try:
+        state = await asyncio.to_thread(_load_sync_state)
+        detail_sem = asyncio.Semaphore(DETAIL_CONCURRENCY)
+        for contenttypeid in TOUR_CONTENT_TYPE_IDS:
+            count = await _sync_content_type(contenttypeid, state.get(contenttypeid), detail_sem)
+            progress["changed"][str(contenttypeid)] = count
+        progress["status"] = "done"
+    except Exception as e:
+        progress.update({"status": "failed", "error": str(e)})
+        print(f"❌ TourAPI 증분 동기화 실패: {e}")
+    finally:
+        progress["elapsed_seconds"] = round(time.monotonic() - started, 1)
+        progress["updated_at"] = int(time.time())
+        try:
+            await set_cached(SYNC_PROGRESS_KEY, progress, expire_seconds=60 * 60 * 24 * 7)
+        finally:
+            await redis_client.delete(INGEST_LOCK_KEY)
+
+    # 일부 관광타입만 반영되고 실패했어도 commit된 변경분은 캐시 무효화
+    if any(progress["changed"].values()):
+        await _on_catalog_changed()
+
+    return progress
@@ -0,0 +1,52 @@
+# app/services/place_projection.py
+from typing import NamedTuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, load_only, selectinload, with_expression
+
+from app.models.hashtag import PlaceTag
+from app.models.places import Place
+
+
+# ------------------------------------------
+# 필요한 컬럼만 읽는 경량 행 (overview/homepage/tel 등 제외)
+# ------------------------------------------
+class PlaceCardRow(NamedTuple):
+    id: int
+    contentid: str
+    title: str
+    addr1: str | None
+    firstimage: str | None
+    mapx: float | None
+    mapy: float | None
+    contenttypeid: int
+
+
+def project(query: Query, row_type: type[NamedTuple]) -> list:
+    """
+    query를 row_type 필드 이름과 같은 Place 컬럼만 SELECT 해서 row_type 목록으로 반환
+    """
+    columns = [getattr(Place, name) for name in row_type._fields]
+    return [row_type._make(row) for row in query.with_entities(*columns)]
+
+
+# ------------------------------------------
+# 목록 카드 (ORM 엔티티 유지 - 개인화 정렬/해시태그 접근용)
+# ------------------------------------------
+# 카드 렌더링 + 정렬/커서 + 개인화 점수에 쓰는 컬럼
+LIST_CARD_COLUMNS = (
+    Place.id, Place.contentid, Place.contenttypeid, Place.title, Place.addr1,
+    Place.firstimage, Place.has_image, Place.created_at, Place.updated_at,
+)
+# 개요는 첫 문장만 (앞부분만 잘라서 전송)
+OVERVIEW_SUMMARY_CHARS = 300
+
+
+def list_card_options() -> tuple:
+    summary = func.substring_index(func.substr(Place.overview, 1, OVERVIEW_SUMMARY_CHARS), ".", 1)
+    return (
+        load_only(*LIST_CARD_COLUMNS),
+        with_expression(Place.overview_summary, summary),
+        # 카드의 해시태그 배지 + 개인화 점수 계산용 - 페이지 전체를 쿼리 1회로
+        selectinload(Place.hashtags).joinedload(PlaceTag.tag),
+    )
@@ -0,0 +1,86 @@
+# app/services/place_search.py
+import re
+
+from sqlalchemy import Float, type_coerce
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+
+from app.models.places import Place
+
+# MySQL FULLTEXT 불리언 모드 연산자 (검색어에서 제거)
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+# 제목 일치 가중치 (제목 점수 × 가중치 + 제목/개요 점수)
+TITLE_WEIGHT = 2.0
+MAX_TERMS = 8
+
+
+def to_boolean_query(search: str) -> str | None:
+    """
+    사용자 검색어 → FULLTEXT 불리언 모드 검색식
+    모든 단어 필수(+), 접두어 일치(*)
+    """
+    terms = [t for t in _BOOLEAN_OPERATORS.sub(" ", search).split() if t][:MAX_TERMS]
+    if not terms:
+        return None
+    return " ".join(f"+{t}*" for t in terms)
+
+
+def search_relevance(boolean_query: str):
+    """
+    관련도 점수 식 (제목 일치에 가중치)
+    """
+    title_score = type_coerce(match(Place.title, against=boolean_query).in_boolean_mode(), Float)
+    text_score = type_coerce(match(Place.title, Place.overview, against=boolean_query).in_boolean_mode(), Float)
+    return title_score * TITLE_WEIGHT + text_score
+
+
+def apply_place_search(query: Query, search: str | None):
+    """
+    제목/개요 FULLTEXT(ngram) 검색 조건 적용
+    (query, 관련도 점수 식) 반환 - 검색어가 없으면 점수 식은 None
+    """
+    boolean_query = to_boolean_query(search or "")
+    if not boolean_query:
+        return query, None
+
+    condition = match(Place.title, Place.overview, against=boolean_query).in_boolean_mode()
+    return query.filter(condition), search_relevance(boolean_query)
+
+
+def search_places(db: Session, search: str, page: int = 1, per_page: int = 20, contenttypeid: int | None = None) -> dict:
+    """
+    관련도순 검색 결과 (JSON API용)
+    """
+    query, relevance = apply_place_search(db.query(Place), search)
+    if relevance is None:
+        return {"total": 0, "page": page, "per_page": per_page, "items": []}
+    if contenttypeid:
+        query = query.filter(Place.contenttypeid == contenttypeid)
+
+    total = query.count()
+    rows = (
+        query.with_entities(
+            Place.contentid, Place.title, Place.addr1, Place.firstimage,
+            Place.contenttypeid, relevance.label("score"),
+        )
+        .order_by(relevance.desc(), Place.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
+    return {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "items": [
+            {
+                "contentid": r.contentid,
+                "title": r.title,
+                "addr1": r.addr1,
+                "firstimage": r.firstimage,
+                "contenttypeid": r.contenttypeid,
+                "score": round(float(r.score or 0), 4),
+            }
+            for r in rows
+        ],
+    }
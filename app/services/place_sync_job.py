@@ -0,0 +1,58 @@
+# app/services/place_sync_job.py
+import asyncio
+import os
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from app.services.place_ingest_service import run_place_delta_sync
+from app.services.hashtag_engine import run_queued_hashtag_job
+from app.services.tag_suggest import TAG_STATS_REFRESH_MINUTES, refresh_tag_stats
+from app.services.place_features import rebuild_place_features_if_empty
+from app.services.co_favorites import CO_FAVORITES_REBUILD_MINUTES, compact_co_favorites
+
+# 증분 동기화 주기 (분)
+PLACE_SYNC_INTERVAL_MINUTES = int(os.getenv("PLACE_SYNC_INTERVAL_MINUTES", "60"))
+
+
+async def run_place_sync_cycle():
+    """
+    증분 동기화 → 바뀐 장소만 해시태그 재생성
+    """
+    await run_place_delta_sync()
+    await asyncio.to_thread(run_queued_hashtag_job)
+
+
+def start_place_sync_scheduler() -> AsyncIOScheduler:
+    """
+    TourAPI 증분 동기화 주기 실행
+    여러 워커에서 동시에 떠도 Redis 락으로 한 곳에서만 실행됨
+    """
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        run_place_sync_cycle,
+        'interval',
+        minutes=PLACE_SYNC_INTERVAL_MINUTES,
+        id="place_delta_sync",
+        coalesce=True,
+        max_instances=1,
+    )
+    # 태그 자동완성용 장소 수 재계산 (동기 함수 → 스레드에서 실행)
+    scheduler.add_job(
+        refresh_tag_stats,
+        'interval',
+        minutes=TAG_STATS_REFRESH_MINUTES,
+        id="tag_stats_refresh",
+        coalesce=True,
+        max_instances=1,
+    )
+    # 즐겨찾기 변경분 정리 → 각 워커가 동시 출현 모델을 DB에서 다시 생성
+    scheduler.add_job(
+        compact_co_favorites,
+        'interval',
+        minutes=CO_FAVORITES_REBUILD_MINUTES,
+        id="co_favorites_compact",
+        coalesce=True,
+        max_instances=1,
+    )
+    # 추천용 장소 특징이 한 번도 계산되지 않았으면 시작 직후 계산
+    scheduler.add_job(rebuild_place_features_if_empty, id="place_features_init")
+    scheduler.start()
+    return scheduler
@@ -1,9 +1,13 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 import requests
 from app.models.places import Place, PlaceDetail
-from app.models.hashtag import PlaceTag, Tag
+from app.models.hashtag import PlaceTag
 from app.models.user import User
 import math
 from typing import List, Dict
@@ -11,7 +15,13 @@ import os
 from app.services.recommendation_service import (
     sort_places_with_preferences,
 )
-from sqlalchemy import case, or_
+from sqlalchemy import and_, case, func, not_, or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from app.utils.http_client import fetch_json
+from app.services.place_search import apply_place_search
+from app.services.place_count import count_places
+from app.services.tag_index import apply_tag_filter
+from app.services.place_projection import PlaceCardRow, list_card_options, project
 
 
 
@@ -21,6 +31,15 @@ SERVICE_KEY = os.getenv("SERVICE_KEY")
 
 MAX_SAVE_COUNT = 30000  # DB에 저장할 최대 관광지 개수
 
+# 관광지 데이터 버전 키 (수집/동기화 commit 시 증가 → 이 버전을 포함한 캐시 키 전부 무효화)
+PLACES_CATALOG_VERSION = "places_catalog"
+
+# keyset 정렬 목록에서 번호 링크로 보여줄 앞쪽 페이지 수 (그 뒤는 이전/다음 커서로 이동)
+NUMBERED_PAGE_LINKS = 5
+# 목록 요청당 최대 SQL 수: count(캐시 미스 시) + 페이지 + 해시태그(selectin) + 사용자 선호도
+# (tests/test_list_query_budget.py 에서 확인)
+LIST_QUERY_BUDGET = 4
+
 # ------------------------------------------
 # 1️⃣ TourAPI - 관광지 목록(areaBasedList2) 가져오기
 # ------------------------------------------
@@ -71,18 +90,150 @@ def fetch_place_detail(contentid: str) -> dict:
     return item
 
 # ------------------------------------------
-# 이미지 불러오기
+# 비동기 TourAPI 호출 (대량 수집용, 공용 커넥션 풀 사용)
 # ------------------------------------------
-def fetch_detail_images(contentid: str) -> List[Dict[str, str]]:
+def _extract_items(data: dict) -> list:
+    body = data["response"]["body"]
+    items = body.get("items") or {}
+    item = items.get("item", []) if isinstance(items, dict) else []
+    if not isinstance(item, list):
+        item = [item]
+    return item
+
+
+async def fetch_tour_data_async(
+    page: int = 1, num_of_rows: int = 100, contenttypeid: int | None = None
+) -> tuple[list, int]:
     """
-    TourAPI detailImage1 API 호출 - 썸네일 갤러리용 originimgurl 리스트
+    areaBasedList2 비동기 호출 (arrange=C: 수정일순)
+    (items, totalCount) 반환
     """
-    if not SERVICE_KEY:
-        print("⚠️ SERVICE_KEY 환경변수 필요!")
-        return []
-    
-    url = f"{TOUR_API_BASE}/detailImage2"  # detailImage1 endpoint
     params = {
+        "MobileOS": "ETC",
+        "MobileApp": "WALKorea",
+        "_type": "json",
+        "numOfRows": num_of_rows,
+        "pageNo": page,
+        "serviceKey": SERVICE_KEY,
+        "arrange": "C",
+    }
+    if contenttypeid:
+        params["contentTypeId"] = contenttypeid
+    data = await fetch_json(f"{TOUR_API_BASE}/areaBasedList2", params)
+    total_count = int(data["response"]["body"].get("totalCount") or 0)
+    return _extract_items(data), total_count
+
+
+async def fetch_place_detail_async(contentid: str) -> dict:
+    """
+    detailCommon2 비동기 호출
+    """
+    params = {
+        "MobileOS": "ETC",
+        "MobileApp": "WALKorea",
+        "_type": "json",
+        "contentId": contentid,
+        "serviceKey": SERVICE_KEY,
+    }
+    data = await fetch_json(f"{TOUR_API_BASE}/detailCommon2", params)
+    items = _extract_items(data)
+    return items[0] if items else {}
+
+
+def build_place_row(item: dict, detail: dict | None) -> dict:
+    """
+    areaBasedList2 item + detailCommon2 결과 → Place 컬럼 dict
+    detail이 None이면(이미 저장된 장소 갱신) 상세 컬럼은 None → upsert 시 기존 값 유지
+    """
+    if detail is None:
+        detail_values = dict.fromkeys(PLACE_DETAIL_COLUMNS)
+    else:
+        detail_values = {col: detail.get(col, "") for col in PLACE_DETAIL_COLUMNS}
+
+    row = {
+        "contentid": str(item["contentid"]),
+        "contenttypeid": item.get("contenttypeid", 0),
+        "title": item.get("title", ""),
+        "addr1": item.get("addr1", ""),
+        "addr2": item.get("addr2", ""),
+        "areacode": item.get("areacode"),
+        "sigungucode": item.get("sigungucode"),
+        "mapx": float(item.get("mapx")) if item.get("mapx") else None,
+        "mapy": float(item.get("mapy")) if item.get("mapy") else None,
+        "cat1": item.get("cat1", ""),
+        "cat2": item.get("cat2", ""),
+        "cat3": item.get("cat3", ""),
+        "firstimage": (detail or {}).get("firstimage") or item.get("firstimage", ""),
+        "firstimage2": (detail or {}).get("firstimage2") or item.get("firstimage2", ""),
+        **detail_values,
+    }
+    row["has_image"] = bool(row["firstimage"])
+    return row
+
+
+# ------------------------------------------
+# Place 일괄 upsert (INSERT ... ON DUPLICATE KEY UPDATE)
+# ------------------------------------------
+# 목록(areaBasedList2)에서 항상 최신값으로 덮어쓰는 컬럼
+PLACE_LIST_COLUMNS = [
+    "contenttypeid", "title", "addr1", "addr2", "areacode", "sigungucode",
+    "mapx", "mapy", "cat1", "cat2", "cat3", "firstimage", "firstimage2", "has_image",
+]
+# detailCommon2에서만 오는 컬럼 (None이면 기존 값 유지)
+PLACE_DETAIL_COLUMNS = ["overview", "homepage", "tel", "zipcode"]
+# 값이 바뀌었을 때만 updated_at 갱신
+PLACE_TRACKED_COLUMNS = ["title", "addr1", "addr2", "mapx", "mapy", "firstimage", "firstimage2", "overview"]
+
+
+def upsert_places(db: Session, rows: List[dict]) -> int:
+    """
+    한 페이지 분량의 Place row를 단일 INSERT ... ON DUPLICATE KEY UPDATE 로 저장
+    - 신규 contentid는 INSERT
+    - 기존 contentid는 제목/주소/이미지 등 갱신, 변경된 경우에만 updated_at 갱신
+    row에 updated_at이 있으면(증분 동기화) 그 값을 그대로 사용
+    synced_at은 이 서버에서 실제로 바뀐 시각 (UTC, 내보내기 증분 조회 기준)
+    commit은 호출하는 쪽에서 수행
+    """
+    if not rows:
+        return 0
+
+    synced_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    rows = [{**row, "synced_at": synced_at} for row in rows]
+    table = Place.__table__
+    stmt = mysql_insert(table).values(rows)
+    inserted = stmt.inserted
+
+    def new_value(col: str):
+        if col in PLACE_DETAIL_COLUMNS:
+            return func.coalesce(inserted[col], table.c[col])
+        return inserted[col]
+
+    changed = or_(*(
+        not_(table.c[col].op("<=>")(new_value(col))) for col in PLACE_TRACKED_COLUMNS
+    ))
+
+    # MySQL은 SET 절을 왼쪽부터 적용하므로 updated_at / synced_at 비교를 가장 먼저 수행
+    if "updated_at" in rows[0]:
+        # 증분 동기화는 TourAPI에서 바뀐 항목만 오므로 항상 갱신
+        updates = [("updated_at", inserted.updated_at), ("synced_at", inserted.synced_at)]
+    else:
+        updates = [
+            ("updated_at", case((changed, func.now()), else_=table.c.updated_at)),
+            ("synced_at", case((changed, inserted.synced_at), else_=table.c.synced_at)),
+        ]
+    updates += [(col, new_value(col)) for col in PLACE_LIST_COLUMNS + PLACE_DETAIL_COLUMNS]
+
+    result = db.execute(stmt.on_duplicate_key_update(updates))
+    return result.rowcount
+
+# ------------------------------------------
+# 이미지 불러오기
+# ------------------------------------------
+DETAIL_IMAGE_LIMIT = 12  # 최대 12개만
+
+
+def _detail_images_params(contentid: str) -> dict:
+    return {
         "serviceKey": SERVICE_KEY,
         "contentId": contentid,
         "MobileOS": "ETC",
@@ -90,84 +241,63 @@ def fetch_detail_images(contentid: str) -> List[Dict[str, str]]:
         "imageYN": "Y",
         "_type": "json"
     }
-    
+
+
+def parse_detail_images(data: dict) -> List[Dict[str, str]] | None:
+    """
+    detailImage2 응답 → originimgurl / smallimageurl 리스트 (중복 제거)
+    API 에러 응답이면 None
+    """
+    header = data["response"]["header"]
+    if header["resultCode"] != "0000":
+        print(f"❌ TourAPI 이미지 에러: {header['resultMsg']}")
+        return None
+
+    images = []
+    seen_urls = set()
+    for item in _extract_items(data):
+        url = item.get("originimgurl")
+        if url and url not in seen_urls:
+            images.append({"originimgurl": url, "smallimageurl": item.get("smallimageurl")})
+            seen_urls.add(url)
+            if len(images) >= DETAIL_IMAGE_LIMIT:
+                break
+    return images
+
+
+def fetch_detail_images(contentid: str) -> List[Dict[str, str]]:
+    """
+    TourAPI detailImage2 API 호출 - 썸네일 갤러리용 originimgurl 리스트
+    """
+    if not SERVICE_KEY:
+        print("⚠️ SERVICE_KEY 환경변수 필요!")
+        return []
+
     try:
-        res = requests.get(url, params=params, timeout=10)
+        res = requests.get(f"{TOUR_API_BASE}/detailImage2", params=_detail_images_params(contentid), timeout=10)
         res.raise_for_status()
-        data = res.json()
-        
-        if data["response"]["header"]["resultCode"] == "0000":
-            items = data["response"]["body"]["items"]["item"]
-            if not isinstance(items, list):
-                items = [items]
-            
-            # originimgurl만 추출 (중복 제거)
-            images = []
-            seen_urls = set()
-            for item in items:
-                url = item.get("originimgurl")
-                if url and url not in seen_urls:
-                    images.append({"originimgurl": url})
-                    seen_urls.add(url)
-                    if len(images) >= 12:  # 최대 12개만
-                        break
-            return images
-        else:
-            print(f"📡 이미지 API URL 요청: {url}")
-            print(f"📡 응답 데이터: {data}")
-            print(f"❌ TourAPI 이미지 에러: {data['response']['header']['resultMsg']}")
-            return []
-            
+        return parse_detail_images(res.json()) or []
     except Exception as e:
         print(f"❌ 이미지 API 호출 실패: {e}")
         return []
+
+
+async def fetch_detail_images_async(contentid: str, timeout: float | None = None) -> List[Dict[str, str]] | None:
+    """
+    detailImage2 비동기 호출 (공용 aiohttp 세션)
+    네트워크 오류는 예외로 전달, API 에러 응답은 None
+    """
+    data = await fetch_json(
+        f"{TOUR_API_BASE}/detailImage2", _detail_images_params(contentid), retries=1, timeout=timeout
+    )
+    return parse_detail_images(data)
     
     
 # ------------------------------------------
 # 디테일 정보2 가져오기
 # ------------------------------------------
-def fetch_detail_info(contentid: str, contenttypeid: str):
-    try:
-        url = f"{TOUR_API_BASE}/detailIntro2"
-
-        params = {
-            "MobileOS": "ETC",
-            "MobileApp": "AppTest",
-            "serviceKey": SERVICE_KEY,
-            "contentId": contentid,
-            "contentTypeId": contenttypeid,
-            "_type": "json"
-        }
-        print("\n====== 📡 DETAIL INTRO2 요청 ======")
-        print("URL:", url)
-        print("Params:", params)
-
-        print("📡 detailInfo2 URL:", url)
-
-        response = requests.get(url, params=params)
-        data = response.json()
-
-        header = data["response"]["header"]
-        result_code = header["resultCode"]
-
-        if result_code not in ["0000", "000"]:
-            print("❌ detailInfo2 에러:", header["resultMsg"])
-            return None
-
-        body = data["response"]["body"]
-        items = body.get("items", {}).get("item", [])
-
-        print("📡 detailInfo2 응답:", items)
-
-        if not items:
-            return None
-
-        raw_item = items[0]  # detailIntro2는 1개만 반환
-
-        # ---------------------------
-        # ⭐ contentTypeId별 필드 정의
-        # ---------------------------
-        INFO_FIELDS = {
+# contentTypeId별 필드 정의
+DETAIL_INFO_FIELDS = {
     "12": {  # 관광지
         "accomcount": "수용인원",
         "chkbabycarriage": "유모차대여정보",
@@ -316,127 +446,82 @@ def fetch_detail_info(contentid: str, contenttypeid: str):
     },
 }
 
-        # contentTypeId에 해당하는 필드 목록
-        fields = INFO_FIELDS.get(str(contenttypeid), {})
 
-        # ---------------------------
-        # ⭐ 필드 값 필터링
-        # ---------------------------
-        filtered_info = []
-        for key, label in fields.items():
-            value = raw_item.get(key)
-            if value and value != "":
-                filtered_info.append({
-                    "label": label,
-                    "value": value
-                })
-
-        print("📘 필터링된 detailInfo:", filtered_info)
+def _detail_info_params(contentid: str, contenttypeid: str) -> dict:
+    return {
+        "MobileOS": "ETC",
+        "MobileApp": "AppTest",
+        "serviceKey": SERVICE_KEY,
+        "contentId": contentid,
+        "contentTypeId": contenttypeid,
+        "_type": "json"
+    }
 
-        return filtered_info
 
-    except Exception as e:
-        print("❌ detailIntro2 요청 실패:", e)
+def parse_detail_info(data: dict, contenttypeid: str) -> list | None:
+    """
+    detailIntro2 응답 → [{"label", "value"}] 리스트
+    API 에러 응답이면 None
+    """
+    header = data["response"]["header"]
+    if header["resultCode"] not in ["0000", "000"]:
+        print("❌ detailInfo2 에러:", header["resultMsg"])
         return None
 
+    items = _extract_items(data)
+    if not items:
+        return []
 
+    raw_item = items[0]  # detailIntro2는 1개만 반환
 
+    # contentTypeId에 해당하는 필드 값만 필터링
+    fields = DETAIL_INFO_FIELDS.get(str(contenttypeid), {})
+    filtered_info = []
+    for key, label in fields.items():
+        value = raw_item.get(key)
+        if value and value != "":
+            filtered_info.append({
+                "label": label,
+                "value": value
+            })
+    return filtered_info
 
 
+def fetch_detail_info(contentid: str, contenttypeid: str):
+    try:
+        response = requests.get(
+            f"{TOUR_API_BASE}/detailIntro2", params=_detail_info_params(contentid, contenttypeid), timeout=10
+        )
+        return parse_detail_info(response.json(), contenttypeid)
+    except Exception as e:
+        print("❌ detailIntro2 요청 실패:", e)
+        return None
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+async def fetch_detail_info_async(contentid: str, contenttypeid: str, timeout: float | None = None) -> list | None:
+    """
+    detailIntro2 비동기 호출 (공용 aiohttp 세션)
+    네트워크 오류는 예외로 전달, API 에러 응답은 None
+    """
+    data = await fetch_json(
+        f"{TOUR_API_BASE}/detailIntro2", _detail_info_params(contentid, contenttypeid), retries=1, timeout=timeout
+    )
+    return parse_detail_info(data, contenttypeid)
 
 
 # ------------------------------------------
 # 3️⃣ DB 저장 - 최대 30,000개
 # ------------------------------------------
-def save_places_to_db(db: Session, num_of_rows: int = 1000, max_pages: int = 1000):
+def save_places_to_db(db: Session, num_of_rows: int = 100, max_pages: int = 1000, resume: bool = True):
     """
-    areaBasedList2에서 목록을 가져와
-    detailCommon2 상세정보까지 포함해 DB에 저장
+    areaBasedList2 목록 + detailCommon2 상세정보를 DB에 저장 (스크립트/동기 호출용)
+    실제 수집은 place_ingest_service의 비동기 병렬 수집 엔진이 수행
     최대 30,000개까지만 저장
     """
-    page = 1
-    saved_count = db.query(Place).count()  # 이미 저장된 개수 확인
-
-    print(f"현재 DB 저장 개수: {saved_count}개")
-
-    while page <= max_pages:
-        # 최대 30,000개 저장 도달 시 종료
-        if saved_count >= MAX_SAVE_COUNT:
-            print("📌 최대 30,000개 저장 완료 → 종료")
-            break
-
-        items = fetch_tour_data(page, num_of_rows=num_of_rows)
-
-        if not items:
-            print(f"⚠ 페이지 {page}에서 데이터 없음 → 종료")
-            break
-
-        # 페이지별 처리 로그
-        print(f"📄 {page} 페이지 처리 중... (총 {saved_count}개)")
-
-        for i in items:
-            if saved_count >= MAX_SAVE_COUNT:
-                break
-
-            contentid = str(i["contentid"])
-
-            # 중복 체크
-            existing = db.query(Place).filter(Place.contentid == contentid).first()
-            if existing:
-                continue
-
-            # 상세정보 가져오기
-            detail = fetch_place_detail(contentid)
-
-            # Place 저장
-            place = Place(
-                contentid=contentid,
-                contenttypeid=i.get("contenttypeid", 0),
-                title=i.get("title", ""),
-                addr1=i.get("addr1", ""),
-                addr2=i.get("addr2", ""),
-                areacode=i.get("areacode"),
-                sigungucode=i.get("sigungucode"),
-                mapx=float(i.get("mapx")) if i.get("mapx") else None,
-                mapy=float(i.get("mapy")) if i.get("mapy") else None,
-                cat1=i.get("cat1", ""),
-                cat2=i.get("cat2", ""),
-                cat3=i.get("cat3", ""),
-                overview=detail.get("overview", ""),
-                firstimage=detail.get("firstimage", ""),
-                firstimage2=detail.get("firstimage2", ""),
-                homepage=detail.get("homepage", ""),
-                tel=detail.get("tel", ""),
-                zipcode=detail.get("zipcode", ""),
-            )
-            db.add(place)
+    import asyncio
+    from app.services.place_ingest_service import run_place_ingestion
 
-
-            saved_count += 1
-
-        db.commit()
-        page += 1
-
-    print(f"🎉 최종 저장 개수: {saved_count}개")
+    return asyncio.run(run_place_ingestion(num_of_rows=num_of_rows, max_pages=max_pages, resume=resume))
 
 
 # ✅ 상세정보 조회 (DB에 없으면 TourAPI 호출 후 저장)
@@ -488,78 +573,253 @@ def get_places_page(db: Session, page: int = 1, per_page: int = 10):
     return places, total_pages
 
 # DB에서 places 전체 조회
-def get_all_places(db: Session):
-    return db.query(Place).filter(Place.mapx.isnot(None), Place.mapy.isnot(None)).all()
+def get_all_places(db: Session) -> list[PlaceCardRow]:
+    return project(db.query(Place).filter(Place.mapx.isnot(None), Place.mapy.isnot(None)), PlaceCardRow)
 
 
-def build_places_context(
-    request: Request,
-    db: Session,
-    page: int = 1,
-    sort: str = "updated",
-    contenttypeid: str | None = None,
-    addr: str | None = None,
-    search: str | None = None,
-    tag: str | None = None,
-    current_user: User | None = None,
-):
-    per_page = 10
-    offset = (page - 1) * per_page
+# ------------------------------------------
+# 목록 조회 파이프라인 (필터 → count → 페이지 → 개인화)
+# /, /places/list, /places/list/json 공용
+# ------------------------------------------
+PLACES_PER_PAGE = 10
+
+# keyset(커서) 페이지네이션 가능한 정렬 → (정렬 컬럼, 오름차순 여부)
+# 모두 (has_image DESC, 정렬 컬럼, id) 복합 인덱스를 그대로 따라감
+KEYSET_SORTS = {
+    "updated": ("updated_at", False),
+    "created": ("created_at", True),
+    "id": (None, False),
+}
 
-    query = db.query(Place)
 
-    if contenttypeid and contenttypeid.isdigit():
-        query = query.filter(Place.contenttypeid == int(contenttypeid))
+class InvalidCursor(ValueError):
+    pass
 
-    if addr:
-        query = query.filter(Place.addr1.startswith(addr))
 
-    if search:
-        keyword = f"%{search}%"
-        query = query.filter(
-            or_(
-                Place.title.ilike(keyword),
-                Place.overview.ilike(keyword),
-            )
-        )
+def encode_list_cursor(sort: str, place: Place, backward: bool = False) -> str:
+    """
+    행의 정렬 키 → 불투명 커서 문자열
+    backward=True면 이 행 앞쪽(이전 페이지)을 가리키는 커서
+    """
+    column, _ = KEYSET_SORTS[sort]
+    value = getattr(place, column) if column else None
+    payload = [sort, int(bool(place.has_image)), value.isoformat() if value else None, place.id]
+    if backward:
+        payload.append(1)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-    if tag:
-        query = query.join(PlaceTag).join(Tag).filter(
-            Tag.name.ilike(f"%{tag}%")
-        ).distinct(Place.id)
 
-    if sort == "updated":
-        query = query.order_by(
-            case((Place.firstimage != "", 1), else_=0).desc(),
-            Place.updated_at.desc(),
-        )
-    elif sort == "created":
-        query = query.order_by(
-            case((Place.firstimage != "", 1), else_=0).desc(),
-            Place.created_at.asc(),
-        )
-    else:
-        query = query.order_by(
-            case((Place.firstimage != "", 1), else_=0).desc(),
-            Place.id.desc(),
-        )
+def decode_list_cursor(cursor: str, sort: str) -> tuple[int, datetime | None, int, bool]:
+    """
+    커서 문자열 → (has_image, 정렬 컬럼 값, id, 이전 페이지 방향 여부)
+    다른 정렬에서 만든 커서이거나 형식이 틀리면 InvalidCursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, has_image, value, place_id, *rest = json.loads(raw)
+        value = datetime.fromisoformat(value) if value else None
+        has_image, place_id = int(has_image), int(place_id)
+        backward = bool(rest and rest[0])
+    except (ValueError, TypeError):
+        raise InvalidCursor("잘못된 커서입니다.")
+    if cursor_sort != sort:
+        raise InvalidCursor("정렬 조건이 커서와 다릅니다.")
+    return has_image, value, place_id, backward
+
+
+@dataclass
+class PlaceListPlan:
+    """
+    목록 조회 조건 - 한 번 만들어 count/페이지 조회에 같이 사용
+    """
+    page: int = 1
+    sort: str = "updated"
+    contenttypeid: str | None = None
+    addr: str | None = None
+    search: str | None = None
+    tag: str | None = None
+    per_page: int = PLACES_PER_PAGE
+    # 이전 응답의 next_cursor / prev_cursor - 있으면 OFFSET 대신 keyset 조건으로 조회
+    cursor: str | None = None
+
+    @property
+    def offset(self) -> int:
+        return (max(self.page, 1) - 1) * self.per_page
+
+    @property
+    def uses_keyset(self) -> bool:
+        # 관련도순은 점수가 인덱스에 없으므로 OFFSET 유지
+        return self.sort in KEYSET_SORTS
+
+    @property
+    def backward(self) -> bool:
+        # prev_cursor로 이전 페이지를 읽는 중인지
+        return bool(self.cursor and self.uses_keyset and decode_list_cursor(self.cursor, self.sort)[3])
+
+    def filtered_query(self, db: Session):
+        """
+        필터만 적용된 query와 검색 관련도 식 (정렬 없음 → count에 그대로 사용)
+        """
+        query = db.query(Place)
+
+        if self.contenttypeid and self.contenttypeid.isdigit():
+            query = query.filter(Place.contenttypeid == int(self.contenttypeid))
+
+        if self.addr:
+            query = query.filter(Place.addr1.startswith(self.addr))
+
+        # 제목/개요 전문 검색 (FULLTEXT ngram)
+        query, relevance = apply_place_search(query, self.search)
+
+        # 태그 역색인에서 place_id 교집합 ("a,b" → 두 태그 모두)
+        query = apply_tag_filter(query, db, self.tag)
+
+        return query, relevance
+
+    def ordered(self, query, relevance, backward: bool = False):
+        """
+        정렬 적용 - backward면 같은 인덱스를 반대 방향으로 읽음 (이전 페이지, 결과는 호출하는 쪽에서 뒤집음)
+        """
+        if self.sort == "relevance" and relevance is not None:
+            return query.order_by(relevance.desc(), Place.id.desc())
+
+        # 이미지 있는 것 먼저 - 저장된 has_image 컬럼이라 복합 인덱스 순서로 읽음
+        column_name, ascending = KEYSET_SORTS.get(self.sort, KEYSET_SORTS["id"])
+        keys = [(Place.has_image, False)]
+        if column_name:
+            keys.append((getattr(Place, column_name), ascending))
+        keys.append((Place.id, ascending))
+        return query.order_by(*(
+            column.asc() if asc != backward else column.desc() for column, asc in keys
+        ))
+
+    def after_cursor(self, query):
+        """
+        커서 다음 행부터 (has_image DESC, 정렬 컬럼, id) 순서의 keyset 조건
+        이전 페이지 커서면 커서 앞 행부터 - 방향을 뒤집으면 같은 조건 (NULL 위치도 함께 뒤집힘)
+        """
+        has_image, value, last_id, backward = decode_list_cursor(self.cursor, self.sort)
+        column_name, ascending = KEYSET_SORTS[self.sort]
+        if backward:
+            ascending = not ascending
+
+        if column_name is None:
+            tail = Place.id > last_id if ascending else Place.id < last_id
+        else:
+            # MySQL은 NULL을 가장 작은 값으로 정렬 (ASC면 맨 앞, DESC면 맨 뒤)
+            column = getattr(Place, column_name)
+            if ascending:
+                if value is None:
+                    tail = or_(column.isnot(None), and_(column.is_(None), Place.id > last_id))
+                else:
+                    tail = or_(column > value, and_(column == value, Place.id > last_id))
+            else:
+                if value is None:
+                    tail = and_(column.is_(None), Place.id < last_id)
+                else:
+                    tail = or_(column < value, and_(column == value, Place.id < last_id), column.is_(None))
+
+        return query.filter(or_(
+            Place.has_image > has_image if backward else Place.has_image < has_image,
+            and_(Place.has_image == has_image, tail),
+        ))
+
+
+def run_place_list(db: Session, plan: PlaceListPlan, current_user: User | None = None) -> dict:
+    """
+    목록 1페이지 조회 - count 1회 + 페이지 조회 1회 + 해시태그 1회 + (로그인 시) 사용자 선호도 1회
+    """
+    query, relevance = plan.filtered_query(db)
 
-    total = query.count()
-    total_pages = (total + per_page - 1) // per_page
-    places = query.offset(offset).limit(per_page).all()
+    # 필터별 개수는 Redis 캐시 (검색어는 상한까지만 세는 추정치)
+    total, total_is_estimate = count_places(
+        query, PLACES_CATALOG_VERSION,
+        contenttypeid=plan.contenttypeid, addr=plan.addr, search=plan.search, tag=plan.tag,
+    )
+    total_pages = (total + plan.per_page - 1) // plan.per_page
+
+    backward = plan.backward
+    if plan.cursor and plan.uses_keyset:
+        ordered = plan.after_cursor(plan.ordered(query, relevance, backward))
+    else:
+        ordered = plan.ordered(query, relevance).offset(plan.offset)
+    # 한 행 더 읽어 읽는 방향으로 다음 페이지가 있는지 확인
+    rows = ordered.options(*list_card_options()).limit(plan.per_page + 1).all()
+    has_more = len(rows) > plan.per_page
+    places = rows[:plan.per_page]
+    if backward:
+        places.reverse()
+
+    # 개인화 정렬 전 DB 순서의 첫/마지막 행 기준
+    next_cursor = prev_cursor = None
+    if plan.uses_keyset and places:
+        if has_more or backward:
+            next_cursor = encode_list_cursor(plan.sort, places[-1])
+        has_prev = has_more if backward else bool(plan.cursor) or plan.offset > 0
+        if has_prev:
+            prev_cursor = encode_list_cursor(plan.sort, places[0], backward=True)
 
     pref_summary = None
+    score_map: dict = {}
     if current_user:
-        places, pref_summary = sort_places_with_preferences(db, current_user.id, places)
+        places, pref_summary, score_map = sort_places_with_preferences(db, current_user.id, places)
 
     return {
         "places": places,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+        "total_pages": total_pages,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "pref_summary": pref_summary,
+        "score_map": score_map,
+    }
+
+
+def build_places_context(
+    request: Request,
+    db: Session,
+    page: int = 1,
+    sort: str = "updated",
+    contenttypeid: str | None = None,
+    addr: str | None = None,
+    search: str | None = None,
+    tag: str | None = None,
+    current_user: User | None = None,
+    cursor: str | None = None,
+):
+    """
+    목록 화면 context
+    정렬이 keyset 가능하면 이전/다음 링크는 커서로 이동 (깊은 페이지도 OFFSET 없이 같은 비용)
+    page는 커서 이동 시 화면 표시용으로만 따라다님
+    """
+    plan = PlaceListPlan(
+        page=page,
+        sort=sort,
+        contenttypeid=contenttypeid,
+        addr=addr,
+        search=search,
+        tag=tag,
+        cursor=cursor,
+    )
+    result = run_place_list(db, plan, current_user)
+    total_pages = result["total_pages"]
+
+    return {
+        "places": result["places"],
         "page": page,
         "total_pages": total_pages,
+        "uses_keyset": plan.uses_keyset,
+        "next_cursor": result["next_cursor"],
+        "prev_cursor": result["prev_cursor"],
+        # keyset 정렬은 앞쪽 몇 페이지만 번호 링크 (OFFSET이 작을 때만)
+        "numbered_pages": range(1, min(NUMBERED_PAGE_LINKS, total_pages) + 1),
+        "total_is_estimate": result["total_is_estimate"],
         "sort": sort,
         "contenttypeid": contenttypeid,
         "addr": addr,
         "search": search,
         "tag": tag,
-        "pref_summary": pref_summary,
-    }
\ No newline at end of file
+        "pref_summary": result["pref_summary"],
+    }
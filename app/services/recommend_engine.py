@@ -0,0 +1,101 @@
+# app/services/recommend_engine.py
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.places import Place
+from app.services.place_features import FeatureMatrix, get_feature_matrix, score_features
+from app.services.place_projection import PlaceCardRow, project
+
+
+def candidate_rows(
+    matrix: FeatureMatrix,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> np.ndarray:
+    """
+    지역(addr1 앞 2글자) / 관광타입으로 후보 행을 먼저 거름
+    """
+    return filter_rows(matrix, np.arange(len(matrix)), region, contenttypeids)
+
+
+def filter_rows(
+    matrix: FeatureMatrix,
+    rows: np.ndarray,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> np.ndarray:
+    """
+    이미 고른 행(rows) 중 지역 / 관광타입 조건에 맞는 것만 (순서 유지)
+    """
+    if region:
+        rows = rows[matrix.regions[rows] == region[:2]]
+    if contenttypeids:
+        rows = rows[np.isin(matrix.contenttypeids[rows], contenttypeids)]
+    return rows
+
+
+def top_rows(matrix: FeatureMatrix, rows: np.ndarray, total: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    점수 상위 top_n개 (동점이면 최근 등록 장소 먼저)
+    전체 정렬 대신 argpartition으로 상위만 뽑은 뒤 정렬
+    """
+    if not len(rows):
+        return rows
+    # 점수(이산값) * 1e9 + place_id → 한 번의 비교로 점수, id 순서 모두 반영
+    key = np.round(total, 6) * 1e9 + matrix.place_ids[rows]
+    if len(rows) > top_n:
+        part = np.argpartition(-key, top_n - 1)[:top_n]
+    else:
+        part = np.arange(len(rows))
+    order = part[np.argsort(-key[part])]
+    return order
+
+
+def rank_places(
+    db: Session,
+    prefs: dict,
+    top_n: int,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> list[tuple[int, dict]]:
+    """
+    전체 장소를 선호도로 점수 매겨 상위 top_n개 → [(place_id, 점수 dict)]
+    """
+    matrix = get_feature_matrix(db)
+    rows = candidate_rows(matrix, region, contenttypeids)
+    scores = score_features(matrix, prefs, rows)
+    order = top_rows(matrix, rows, scores["total"], top_n)
+    return [
+        (int(matrix.place_ids[rows[i]]), {name: float(values[i]) for name, values in scores.items()})
+        for i in order
+    ]
+
+
+def score_place_ids(
+    matrix: FeatureMatrix,
+    prefs: dict,
+    place_ids: list[int],
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> list[tuple[int, dict]]:
+    """
+    지정한 장소들만 점수 계산 (행렬에 없거나 조건에 안 맞는 장소는 제외)
+    """
+    rows = matrix.positions(place_ids)
+    rows = filter_rows(matrix, rows[rows >= 0], region, contenttypeids)
+    scores = score_features(matrix, prefs, rows)
+    return [
+        (int(matrix.place_ids[row]), {name: float(values[i]) for name, values in scores.items()})
+        for i, row in enumerate(rows)
+    ]
+
+
+def load_ranked_places(db: Session, ranked: list[tuple[int, dict]]) -> list[tuple[PlaceCardRow, dict]]:
+    """
+    순위 결과 → (카드 행, 점수) 목록 (필요한 컬럼만 조회, 순위 순서 유지)
+    """
+    ids = [place_id for place_id, _ in ranked]
+    if not ids:
+        return []
+    by_id = {row.id: row for row in project(db.query(Place).filter(Place.id.in_(ids)), PlaceCardRow)}
+    return [(by_id[place_id], scores) for place_id, scores in ranked if place_id in by_id]
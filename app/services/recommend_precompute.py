@@ -0,0 +1,146 @@
+# app/services/recommend_precompute.py
+"""
+선호도 조합(시그니처)별 추천 순위 미리 계산
+
+- 점수에 쓰이는 선호 항목(companion / area_theme / activity_type / situation)이 같으면
+  순위도 같으므로, 사용자별이 아니라 조합별로 한 번만 계산해 Redis에 저장
+- 장소 특징이 다시 만들어질 때(장소 목록 갱신 / 해시태그 생성 후) 배치로 전부 다시 계산
+- 요청 시에는 저장된 순위를 읽어 지역/관광타입으로 거르고 상위만 다시 정렬
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.user_profile import UserProfile
+from app.services.place_features import FeatureMatrix, get_feature_matrix, score_features
+from app.services.recommend_engine import filter_rows, rank_places, top_rows
+from app.utils.redis_client import redis_sync_client
+
+SIGNATURE_KEYS = ("companion", "area_theme", "activity_type", "situation")
+# 조합별로 저장할 순위 길이 (필터 후에도 상위 N개가 남도록 넉넉하게)
+PRECOMPUTE_SIZE = int(os.getenv("RECOMMEND_PRECOMPUTE_SIZE", "500"))
+# 특징 버전이 키에 들어가므로 TTL은 오래된 버전 정리용
+PRECOMPUTE_TTL = 60 * 60 * 24 * 2
+PRECOMPUTE_LOCK_KEY = "recommend:precompute:lock"
+
+
+def _canonical(value):
+    if isinstance(value, (list, tuple, set)):
+        return sorted(str(v) for v in value)
+    return value
+
+
+def preference_signature(prefs: dict) -> str:
+    """
+    점수에 영향을 주는 선호 항목만으로 만든 해시 (리스트 순서 무관)
+    """
+    picked = {key: _canonical(prefs.get(key)) for key in SIGNATURE_KEYS}
+    raw = json.dumps(picked, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def signature_key(version: int, signature: str) -> str:
+    return f"recommend:sig:v{version}:{signature}"
+
+
+def _rank_signature(matrix: FeatureMatrix, prefs: dict) -> list[int]:
+    rows = np.arange(len(matrix))
+    total = score_features(matrix, prefs, rows)["total"]
+    order = top_rows(matrix, rows, total, PRECOMPUTE_SIZE)
+    return matrix.place_ids[rows[order]].tolist()
+
+
+def _store_ranking(version: int, signature: str, place_ids: list[int], pipe=None):
+    (pipe or redis_sync_client).set(signature_key(version, signature), json.dumps(place_ids), ex=PRECOMPUTE_TTL)
+
+
+# ------------------------------------------
+# 배치: 모든 선호도 조합의 순위 계산
+# ------------------------------------------
+def precompute_recommendations() -> int | None:
+    """
+    사용자 선호도에서 서로 다른 조합을 모아 조합별 상위 PRECOMPUTE_SIZE개 순위를 저장
+    """
+    if not redis_sync_client.set(PRECOMPUTE_LOCK_KEY, "1", nx=True, ex=60 * 10):
+        return None
+
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        signatures: dict[str, dict] = {}
+        for (prefs,) in db.query(UserProfile.preferences):
+            if prefs:
+                signatures.setdefault(preference_signature(prefs), prefs)
+
+        matrix = get_feature_matrix(db)
+        pipe = redis_sync_client.pipeline(transaction=False)
+        for signature, prefs in signatures.items():
+            _store_ranking(matrix.version, signature, _rank_signature(matrix, prefs), pipe)
+        pipe.execute()
+        print(f"🧮 추천 순위 미리 계산: {len(signatures)}개 조합 ({time.monotonic() - started:.1f}s)")
+        return len(signatures)
+    except Exception as e:
+        print(f"❌ 추천 순위 미리 계산 실패: {e}")
+        return None
+    finally:
+        db.close()
+        redis_sync_client.delete(PRECOMPUTE_LOCK_KEY)
+
+
+# ------------------------------------------
+# 요청 시: 저장된 순위 조회 + 필터 후 재정렬
+# ------------------------------------------
+def _load_ranking(matrix: FeatureMatrix, prefs: dict) -> list[int]:
+    """
+    조합의 저장된 순위 (없으면 계산해서 저장 - 배치 이후 새로 생긴 조합)
+    """
+    signature = preference_signature(prefs)
+    try:
+        data = redis_sync_client.get(signature_key(matrix.version, signature))
+    except Exception:
+        data = None
+    if data:
+        return json.loads(data)
+
+    place_ids = _rank_signature(matrix, prefs)
+    try:
+        _store_ranking(matrix.version, signature, place_ids)
+    except Exception as e:
+        print(f"⚠️ 추천 순위 저장 실패: {e}")
+    return place_ids
+
+
+def rank_precomputed(
+    db: Session,
+    prefs: dict,
+    top_n: int,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> list[tuple[int, dict]]:
+    """
+    rank_places와 같은 결과를 미리 계산한 순위에서 꺼냄
+    필터 때문에 저장된 순위 안에서 top_n개를 못 채우면 전체 계산으로 대체
+    """
+    matrix = get_feature_matrix(db)
+    place_ids = _load_ranking(matrix, prefs)
+
+    positions = matrix.positions(place_ids)
+    # 필터는 저장된 순위 안의 행에만 적용 (전체 행렬을 훑지 않음)
+    positions = filter_rows(matrix, positions[positions >= 0], region, contenttypeids)
+
+    complete = len(place_ids) < PRECOMPUTE_SIZE
+    if len(positions) < top_n and not complete:
+        return rank_places(db, prefs, top_n, region, contenttypeids)
+
+    rows = positions[:top_n]
+    scores = score_features(matrix, prefs, rows)
+    order = top_rows(matrix, rows, scores["total"], top_n)
+    return [
+        (int(matrix.place_ids[rows[i]]), {name: float(values[i]) for name, values in scores.items()})
+        for i in order
+    ]
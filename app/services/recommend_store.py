@@ -0,0 +1,72 @@
+# app/services/recommend_store.py
+"""
+사용자별 추천 결과 저장소 (Redis)
+
+- 모든 워커가 같은 결과를 보므로 /places/recommend/reason 을 어느 워커가 받아도 동일하게 응답
+- 선호도 해시 / 요청 조건 / 장소 특징 버전이 같으면 재계산 없이 사용
+  (장소 목록이 바뀌면 특징 행렬이 다시 만들어지면서 버전이 올라감)
+- TTL + 사용자당 키 1개라 메모리 사용량이 사용자 수 × TOP_N 으로 제한됨
+"""
+import hashlib
+import json
+import os
+
+from app.services.place_features import FEATURES_VERSION
+from app.utils.redis_client import redis_sync_client, get_version_sync
+
+RECOMMEND_TTL = int(os.getenv("RECOMMEND_TTL", str(60 * 60 * 24)))
+
+
+def recommendation_key(user_id: int) -> str:
+    return f"recommend:user:{user_id}"
+
+
+def profile_hash(prefs: dict | None) -> str:
+    """
+    선호도 dict → 짧은 해시 (키 순서와 무관)
+    """
+    raw = json.dumps(prefs or {}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def current_features_version() -> int:
+    try:
+        return get_version_sync(FEATURES_VERSION)
+    except Exception:
+        return -1
+
+
+def load_recommendation(user_id: int) -> dict | None:
+    try:
+        data = redis_sync_client.get(recommendation_key(user_id))
+    except Exception as e:
+        print(f"⚠️ 추천 결과 조회 실패 (user={user_id}): {e}")
+        return None
+    return json.loads(data) if data else None
+
+
+def save_recommendation(user_id: int, entry: dict):
+    try:
+        redis_sync_client.set(
+            recommendation_key(user_id),
+            json.dumps(entry, ensure_ascii=False),
+            ex=RECOMMEND_TTL,
+        )
+    except Exception as e:
+        print(f"⚠️ 추천 결과 저장 실패 (user={user_id}): {e}")
+
+
+def invalidate_recommendation(user_id: int):
+    try:
+        redis_sync_client.delete(recommendation_key(user_id))
+    except Exception as e:
+        print(f"⚠️ 추천 결과 삭제 실패 (user={user_id}): {e}")
+
+
+def is_fresh(entry: dict | None, prefs_hash: str, params: dict, version: int) -> bool:
+    return (
+        entry is not None
+        and entry.get("hash") == prefs_hash
+        and entry.get("params") == params
+        and entry.get("version") == version
+    )
@@ -3,9 +3,28 @@ from app.models.user_profile import UserProfile
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import List, Dict, Tuple
+from app.services.place_features import (
+    NEUTRAL_VALUES,
+    OPPOSITE_KEYWORDS,
+    get_feature_matrix,
+    place_keywords,
+    score_features,
+)
+from app.services.place_projection import PlaceCardRow, project
+from app.services.recommend_engine import load_ranked_places
+from app.services.recommend_precompute import rank_precomputed
+from app.services.co_favorites import blend_co_favorites, favorite_place_ids
+from app.services.recommend_store import (
+    current_features_version,
+    is_fresh,
+    load_recommendation,
+    profile_hash,
+    save_recommendation,
+)
 
-USER_TOP_RECOMMENDED: dict[int, set[int]] = {}
 TOP_N = 12
+# 즐겨찾기 점수를 섞을 때 선호도 순위에서 가져올 후보 배수
+BLEND_CANDIDATE_FACTOR = 4
 
 def recommend_places_for_user(db: Session, user_id: int):
     user_pref = db.query(UserProfile).filter_by(user_id=user_id).first()
@@ -77,18 +96,26 @@ def sort_places_with_preferences(
 
     print(">>> sort_places_with_preferences called, user_id =", user_id, "places:", len(places))
 
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    if not profile or not profile.preferences:
+    prefs = get_user_preferences(db, user_id)
+    if not prefs:
         # 점수 정보가 없으면 원래 리스트 그대로, 점수맵은 빈 dict
         return places, None, {}
 
-    prefs: dict = profile.preferences
+    # 미리 계산한 특징 행렬로 한 번에 점수 계산 (행렬에 아직 없는 새 장소만 개별 계산)
+    matrix = get_feature_matrix(db)
+    positions = matrix.positions([p.id for p in places])
+    found = positions >= 0
+    vector_scores = score_features(matrix, prefs, positions[found])
 
     scored: list[tuple[float, Place, dict]] = []
-    for p in places:
-        detail_scores = score_place_by_preferences(p, prefs)
-        total_score = detail_scores["total"]
-        scored.append((total_score, p, detail_scores))
+    k = 0
+    for p, has_row in zip(places, found):
+        if has_row:
+            detail_scores = {name: float(values[k]) for name, values in vector_scores.items()}
+            k += 1
+        else:
+            detail_scores = score_place_by_preferences(p, prefs)
+        scored.append((detail_scores["total"], p, detail_scores))
 
     scored.sort(key=lambda x: x[0], reverse=True)
     sorted_places: List[Place] = [p for _, p, _ in scored]
@@ -97,36 +124,129 @@ def sort_places_with_preferences(
         p.contentid: detail for _, p, detail in scored
     }
 
-    summary = ", ".join(prefs.get("area_theme", [])) or prefs.get("vibe") or ""
-    return sorted_places, summary, score_map
+    return sorted_places, preference_summary(prefs), score_map
+
+
+def preference_summary(prefs: dict) -> str:
+    return ", ".join(prefs.get("area_theme", [])) or prefs.get("vibe") or ""
+
+
+def recommend_top_places(
+    db: Session,
+    prefs: dict | None,
+    top_n: int = TOP_N,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+    seeds: list[int] | None = None,
+) -> Tuple[List[PlaceCardRow], str | None, Dict[int, dict]]:
+    """
+    전체 장소 중 선호도 상위 top_n개 (지역/관광타입으로 후보 제한 가능)
+    seeds(즐겨찾기한 Place.id)가 있으면 함께 즐겨찾기된 장소 점수를 섞음
+    선호 정보가 없으면 최근 등록 장소
+    """
+    if not prefs:
+        query = db.query(Place)
+        if region:
+            query = query.filter(Place.addr1.like(f"{region}%"))
+        if contenttypeids:
+            query = query.filter(Place.contenttypeid.in_(contenttypeids))
+        return project(query.order_by(Place.id.desc()).limit(top_n), PlaceCardRow), None, {}
+
+    if seeds:
+        # 동시 출현 점수로 순위가 올라올 수 있도록 선호도 후보를 넉넉히
+        ranked = rank_precomputed(db, prefs, top_n * BLEND_CANDIDATE_FACTOR, region, contenttypeids)
+        ranked = blend_co_favorites(db, prefs, ranked, seeds, top_n, region, contenttypeids)
+    else:
+        ranked = rank_precomputed(db, prefs, top_n, region, contenttypeids)
+    ranked = load_ranked_places(db, ranked)
+    places = [row for row, _ in ranked]
+    score_map = {row.contentid: scores for row, scores in ranked}
+    return places, preference_summary(prefs), score_map
+
+
+def recommend_params(
+    top_n: int = TOP_N,
+    region: str | None = None,
+    contenttypeids: list[int] | None = None,
+) -> dict:
+    return {
+        "top_n": top_n,
+        "region": region[:2] if region else None,
+        "contenttypeids": sorted(set(contenttypeids)) if contenttypeids else None,
+    }
 
-def get_place_scores_for_user(
-    db: Session, user_id: int, place_id: int
-) -> dict | None:
-    top_ids = USER_TOP_RECOMMENDED.get(user_id)
-    if not top_ids:
-        print("NO TOP12", user_id, top_ids)
-        return None
 
-    # ★ place_id 도 int 로 맞춰서 비교
-    pid = int(place_id)
-    if pid not in top_ids:
-        print("NOT IN TOP12", user_id, pid, top_ids)
-        return None
+def get_user_preferences(db: Session, user_id: int) -> dict | None:
+    """
+    사용자 선호도 (요청 단위 캐시)
+    세션이 요청마다 새로 만들어지므로 session.info에 두면 같은 요청 안에서만 재사용됨
+    """
+    cache: dict = db.info.setdefault("user_preferences", {})
+    if user_id not in cache:
+        profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        cache[user_id] = profile.preferences if profile and profile.preferences else None
+    return cache[user_id]
 
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    if not profile or not profile.preferences:
-        print("NO PROFILE/PREFS", user_id)
-        return None
 
-    place = db.query(Place).filter(Place.contentid == pid).first()
-    if not place:
-        print("NO PLACE", pid)
-        return None
+def _compute_recommendation(db: Session, user_id: int, prefs: dict | None, params: dict) -> dict:
+    places, summary, score_map = recommend_top_places(
+        db, prefs, params["top_n"], params["region"], params["contenttypeids"],
+        seeds=favorite_place_ids(db, user_id) if prefs else None,
+    )
+    return {
+        "summary": summary,
+        "items": [
+            {
+                "id": p.contentid,
+                "contentid": p.contentid,
+                "title": p.title,
+                "addr1": p.addr1,
+                "firstimage": p.firstimage,
+                "scores": score_map.get(p.contentid, {}),
+            }
+            for p in places
+        ],
+    }
 
-    scores = score_place_by_preferences(place, profile.preferences)
-    print("DETAIL SCORE FOR", user_id, pid, scores)
-    return scores
+
+def get_recommendations(db: Session, user_id: int, params: dict | None = None) -> dict:
+    """
+    사용자 추천 결과 (Redis 저장소 우선)
+    params가 없으면 마지막으로 저장된 조건 그대로 (없으면 기본 조건)
+    선호도 / 조건 / 장소 특징 버전 중 하나라도 바뀌었을 때만 다시 계산
+    """
+    prefs = get_user_preferences(db, user_id)
+    prefs_hash = profile_hash(prefs)
+    version = current_features_version()
+
+    entry = load_recommendation(user_id)
+    if params is None:
+        params = entry["params"] if entry else recommend_params()
+    if is_fresh(entry, prefs_hash, params, version):
+        return entry
+
+    entry = {
+        "hash": prefs_hash,
+        "params": params,
+        "version": version,
+        **_compute_recommendation(db, user_id, prefs, params),
+    }
+    save_recommendation(user_id, entry)
+    return entry
+
+
+def get_place_scores_for_user(
+    db: Session, user_id: int, place_id: int
+) -> dict | None:
+    """
+    사용자가 받은 추천 목록 상위 TOP_N에 있는 장소면 점수, 아니면 None
+    """
+    entry = get_recommendations(db, user_id)
+    pid = int(place_id)
+    for item in entry["items"][:TOP_N]:
+        if int(item["contentid"]) == pid:
+            return item["scores"] or None
+    return None
 
 
 def three_level_match(user_value, place_values: list[str]) -> float:
@@ -139,7 +259,7 @@ def three_level_match(user_value, place_values: list[str]) -> float:
         return max(scores)  # 가장 잘 맞는 것을 사용
 
     # 2) 여기부터는 user_value 가 str 이라고 가정
-    if not user_value or user_value in {"알 수 없음", "보통"}:
+    if not user_value or user_value in NEUTRAL_VALUES:
         return 0.5
 
     if not place_values:
@@ -148,13 +268,7 @@ def three_level_match(user_value, place_values: list[str]) -> float:
     if user_value in place_values:
         return 1.0
 
-    opposite_map = {
-        "산": "바다",
-        "바다": "산",
-        "도시": "자연",
-        "자연": "도시",
-    }
-    opp = opposite_map.get(user_value)
+    opp = OPPOSITE_KEYWORDS.get(user_value)
     if opp and opp in place_values:
         return 0.0
 
@@ -164,39 +278,4 @@ def three_level_match(user_value, place_values: list[str]) -> float:
 def extract_place_keywords(place: Place) -> dict:
 
     tags = [pt.tag.name for pt in getattr(place, "hashtags", [])]
-
-    area_keywords: list[str] = []
-    if place.addr1:
-        if "산" in place.addr1:
-            area_keywords.append("산")
-        if "해수욕장" in place.addr1 or "해변" in place.addr1 or "바다" in place.addr1:
-            area_keywords.append("바다")
-        if any(word in place.addr1 for word in ["도심", "역", "광장"]):
-            area_keywords.append("도시")
-
-    # 활동 타입 예시: 음식점 / 카페 / 박물관 / 축제 등
-    activity_keywords: list[str] = []
-    if place.contenttypeid == 39:
-        activity_keywords.append("맛집")
-    if place.contenttypeid == 14:
-        activity_keywords.append("문화")
-    if place.contenttypeid == 15:
-        activity_keywords.append("축제")
-
-    # 해시태그도 영역/활동에 섞기
-    for t in tags:
-        if t in {"산", "바다", "도시", "자연"}:
-            area_keywords.append(t)
-        if t in {"맛집", "카페", "체험", "축제", "레포츠"}:
-            activity_keywords.append(t)
-
-    # 상황/거리: 예시는 '멀리 가기 싫음/상관 없음/당일치기' 등 선호와 비교할 것
-    vibe_keywords: list[str] = []
-    # 예시: 혼잡도/분위기에 대한 해시태그 있으면 여기서 추가
-
-    return {
-        "tags": tags,
-        "area": area_keywords,
-        "activity": activity_keywords,
-        "vibe": vibe_keywords,
-    }
\ No newline at end of file
+    return place_keywords(place.addr1, place.contenttypeid, tags)
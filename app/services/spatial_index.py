@@ -0,0 +1,202 @@
+# app/services/spatial_index.py
+import heapq
+import math
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.models.places import Place
+
+# 격자 한 칸 크기 (도) - 0.05° ≈ 위도 5.5km / 경도 4.4km (북위 37° 기준)
+CELL_DEG = 0.05
+# 워커별 인덱스 재생성 주기 (초)
+SPATIAL_INDEX_TTL = int(os.getenv("SPATIAL_INDEX_TTL", "600"))
+EARTH_RADIUS_KM = 6371.0
+# 반경 제한이 없을 때 최대 탐색 링 수 (한반도 전체를 덮는 범위)
+MAX_RINGS = int(12 / CELL_DEG)
+
+
+class PlacePoint(NamedTuple):
+    id: int
+    contentid: str
+    title: str
+    addr1: str
+    mapx: float
+    mapy: float
+    contenttypeid: int
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lng: float) -> tuple[int, int]:
+    return int(math.floor(lat / CELL_DEG)), int(math.floor(lng / CELL_DEG))
+
+
+class SpatialGrid:
+    """
+    위경도 격자 기반 근접 검색 인덱스
+    좌표가 있는 Place만 (id, contentid, title, addr1, mapx, mapy, contenttypeid) 형태로 보관
+    """
+
+    def __init__(self, points: list[PlacePoint]):
+        self.points = points
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        for i, p in enumerate(points):
+            self.cells.setdefault(_cell(p.mapy, p.mapx), []).append(i)
+        self.built_at = time.monotonic()
+
+    def _ring(self, center: tuple[int, int], r: int):
+        cy, cx = center
+        if r == 0:
+            yield center
+            return
+        for dy in range(-r, r + 1):
+            yield (cy + dy, cx - r)
+            yield (cy + dy, cx + r)
+        for dx in range(-r + 1, r):
+            yield (cy - r, cx + dx)
+            yield (cy + r, cx + dx)
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 20,
+        radius_km: float | None = None,
+        contenttypeid: int | None = None,
+        exclude_contentid: str | None = None,
+    ) -> list[tuple[float, PlacePoint]]:
+        """
+        실제 거리(haversine) 기준 k-최근접 검색
+        중심 칸부터 링 단위로 넓혀가며, 다음 링의 최소 거리가 현재 k번째 거리보다 멀면 중단
+        """
+        center = _cell(lat, lng)
+        # 한 칸의 최소 폭(km) - 경도 방향이 더 좁고, 북쪽으로 갈수록 좁아지므로 여유 있게 계산
+        cell_km = CELL_DEG * 111.32 * math.cos(math.radians(min(abs(lat) + 5.0, 89.0)))
+        max_rings = MAX_RINGS if radius_km is None else int(radius_km / cell_km) + 1
+
+        heap: list[tuple[float, int]] = []  # (-distance, index) 최대 힙
+        for r in range(max_rings + 1):
+            # 링 r 안의 점은 중심에서 최소 (r - 1) 칸 이상 떨어져 있음
+            if len(heap) >= k and (r - 1) * cell_km > -heap[0][0]:
+                break
+            for cell in self._ring(center, r):
+                for i in self.cells.get(cell, ()):
+                    p = self.points[i]
+                    if contenttypeid is not None and p.contenttypeid != contenttypeid:
+                        continue
+                    if exclude_contentid is not None and p.contentid == exclude_contentid:
+                        continue
+                    d = haversine_km(lat, lng, p.mapy, p.mapx)
+                    if radius_km is not None and d > radius_km:
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, i))
+                    elif d < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d, i))
+
+        return sorted(((-neg_d, self.points[i]) for neg_d, i in heap), key=lambda x: x[0])
+
+    def points_in_bbox(self, south: float, west: float, north: float, east: float) -> list[PlacePoint]:
+        """
+        사각 영역 안의 지점 (겹치는 격자 칸만 확인)
+        """
+        y0, x0 = _cell(south, west)
+        y1, x1 = _cell(north, east)
+        if (y1 - y0 + 1) * (x1 - x0 + 1) > len(self.cells):
+            # 영역이 넓으면 칸 순회보다 전체 순회가 빠름
+            candidates = range(len(self.points))
+        else:
+            candidates = (
+                i
+                for cy in range(y0, y1 + 1)
+                for cx in range(x0, x1 + 1)
+                for i in self.cells.get((cy, cx), ())
+            )
+        result = []
+        for i in candidates:
+            p = self.points[i]
+            if south <= p.mapy < north and west <= p.mapx < east:
+                result.append(p)
+        return result
+
+
+_grid: SpatialGrid | None = None
+_grid_lock = threading.Lock()
+
+
+def _load_points(db: Session) -> list[PlacePoint]:
+    rows = (
+        db.query(
+            Place.id, Place.contentid, Place.title, Place.addr1,
+            Place.mapx, Place.mapy, Place.contenttypeid,
+        )
+        .filter(Place.mapx.isnot(None), Place.mapy.isnot(None))
+        .all()
+    )
+    return [
+        PlacePoint(r.id, r.contentid, r.title, r.addr1 or "", float(r.mapx), float(r.mapy), r.contenttypeid)
+        for r in rows
+    ]
+
+
+def get_spatial_index(db: Session) -> SpatialGrid:
+    """
+    워커별 공유 인덱스 (SPATIAL_INDEX_TTL 마다 재생성)
+    """
+    global _grid
+    grid = _grid
+    if grid is not None and time.monotonic() - grid.built_at < SPATIAL_INDEX_TTL:
+        return grid
+    with _grid_lock:
+        if _grid is None or time.monotonic() - _grid.built_at >= SPATIAL_INDEX_TTL:
+            _grid = SpatialGrid(_load_points(db))
+            print(f"🗺️ 공간 인덱스 생성: {len(_grid.points)}개 / {len(_grid.cells)}칸")
+        return _grid
+
+
+def invalidate_spatial_index():
+    global _grid
+    _grid = None
+
+
+def find_nearby_places(
+    db: Session,
+    lat: float,
+    lng: float,
+    k: int = 20,
+    radius_km: float | None = None,
+    contenttypeid: int | None = None,
+    exclude_contentid: str | None = None,
+) -> list[dict]:
+    """
+    (lat, lng) 기준 가까운 관광지 k개 (거리순)
+    """
+    grid = get_spatial_index(db)
+    results = grid.nearest(
+        lat, lng, k=k, radius_km=radius_km,
+        contenttypeid=contenttypeid, exclude_contentid=exclude_contentid,
+    )
+    return [
+        {
+            "contentid": p.contentid,
+            "title": p.title,
+            "addr1": p.addr1,
+            "mapx": p.mapx,
+            "mapy": p.mapy,
+            "contenttypeid": p.contenttypeid,
+            "distance_km": round(d, 3),
+        }
+        for d, p in results
+    ]
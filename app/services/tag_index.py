@@ -0,0 +1,162 @@
+# app/services/tag_index.py
+import bisect
+import os
+import threading
+import time
+import unicodedata
+
+import numpy as np
+from sqlalchemy import false
+from sqlalchemy.orm import Session
+
+from app.models.hashtag import Tag, PlaceTag
+from app.models.places import Place
+from app.utils.redis_client import get_version_sync
+
+# 해시태그 생성이 커밋되면 증가 (태그 인덱스 / 목록 페이지 캐시 무효화)
+HASHTAGS_VERSION = "hashtags"
+# 워커별 인덱스 재생성 주기 (초) - 버전이 바뀌면 그 전에도 재생성
+TAG_INDEX_TTL = int(os.getenv("TAG_INDEX_TTL", "1800"))
+# Redis 버전 확인 간격 (초)
+VERSION_CHECK_INTERVAL = 5
+# 입력한 태그와 정확히 같은 태그가 없을 때 접두어로 확장할 최대 태그 수
+PREFIX_EXPAND_LIMIT = 50
+
+
+def normalize_tag(value: str) -> str:
+    """
+    "#봄여행 " → "봄여행" (Tag.slug와 같은 규칙: 소문자, # / 공백 제거)
+    """
+    value = unicodedata.normalize("NFC", value or "").strip().lstrip("#")
+    return "".join(value.split()).lower()
+
+
+def parse_tags(value: str | None) -> list[str]:
+    """
+    "봄여행, #바다" → ["봄여행", "바다"]
+    """
+    if not value:
+        return []
+    return [t for t in (normalize_tag(part) for part in value.split(",")) if t]
+
+
+class TagIndex:
+    """
+    태그 slug → place_id 정렬 배열 (uint32) 역색인
+    AND/OR 조합은 정렬 배열의 교집합/합집합으로 계산
+    """
+
+    def __init__(self, postings: dict[str, np.ndarray], version: int):
+        self.postings = postings
+        self.slugs = sorted(postings)
+        self.version = version
+        self.built_at = time.monotonic()
+        self.checked_at = self.built_at
+
+    def prefix(self, prefix: str, limit: int = 20) -> list[str]:
+        prefix = normalize_tag(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.slugs, prefix)
+        result = []
+        for slug in self.slugs[start:]:
+            if not slug.startswith(prefix) or len(result) >= limit:
+                break
+            result.append(slug)
+        return result
+
+    def _term_ids(self, slug: str) -> np.ndarray:
+        """
+        정확히 일치하는 태그가 없으면 접두어가 같은 태그들의 합집합
+        """
+        ids = self.postings.get(slug)
+        if ids is not None:
+            return ids
+        expanded = [self.postings[s] for s in self.prefix(slug, PREFIX_EXPAND_LIMIT)]
+        if not expanded:
+            return np.empty(0, dtype=np.uint32)
+        return np.unique(np.concatenate(expanded))
+
+    def query(self, slugs: list[str], mode: str = "and") -> np.ndarray:
+        """
+        태그 조합에 해당하는 place_id (오름차순)
+        """
+        if not slugs:
+            return np.empty(0, dtype=np.uint32)
+        # 작은 배열부터 교집합하면 중간 결과가 빨리 줄어듦
+        arrays = sorted((self._term_ids(s) for s in slugs), key=len)
+        result = arrays[0]
+        for ids in arrays[1:]:
+            if mode == "or":
+                result = np.union1d(result, ids)
+            else:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+
+_index: TagIndex | None = None
+_index_lock = threading.Lock()
+
+
+def _current_version() -> int:
+    try:
+        return get_version_sync(HASHTAGS_VERSION)
+    except Exception:
+        return -1
+
+
+def _build_index(db: Session, version: int) -> TagIndex:
+    rows = (
+        db.query(Tag.slug, PlaceTag.place_id)
+        .join(PlaceTag, PlaceTag.tag_id == Tag.id)
+        .order_by(Tag.slug, PlaceTag.place_id)
+        .all()
+    )
+    grouped: dict[str, list[int]] = {}
+    for slug, place_id in rows:
+        grouped.setdefault(slug, []).append(place_id)
+    postings = {slug: np.unique(np.array(ids, dtype=np.uint32)) for slug, ids in grouped.items()}
+    return TagIndex(postings, version)
+
+
+def get_tag_index(db: Session) -> TagIndex:
+    """
+    워커별 공유 태그 인덱스
+    해시태그 버전이 바뀌었거나 TAG_INDEX_TTL이 지나면 재생성
+    """
+    global _index
+    index = _index
+    now = time.monotonic()
+    if index is not None and now - index.built_at < TAG_INDEX_TTL:
+        if now - index.checked_at < VERSION_CHECK_INTERVAL:
+            return index
+        index.checked_at = now
+        if _current_version() == index.version:
+            return index
+
+    with _index_lock:
+        version = _current_version()
+        if _index is None or _index is index:
+            _index = _build_index(db, version)
+            print(f"🏷️ 태그 인덱스 생성: {len(_index.slugs)}개 태그")
+        return _index
+
+
+def invalidate_tag_index():
+    global _index
+    _index = None
+
+
+def apply_tag_filter(query, db: Session, tag: str | None, mode: str = "and"):
+    """
+    목록 query에 태그 조건 적용 ("a,b" → 두 태그 모두)
+    """
+    slugs = parse_tags(tag)
+    if not slugs:
+        return query
+    ids = get_tag_index(db).query(slugs, mode)
+    if not len(ids):
+        return query.filter(false())
+    return query.filter(Place.id.in_(ids.tolist()))
@@ -0,0 +1,131 @@
+# app/services/tag_suggest.py
+import bisect
+import heapq
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.hashtag import Tag, PlaceTag, TagStat
+from app.services.tag_index import normalize_tag
+from app.utils.redis_client import redis_sync_client, get_version_sync, bump_version_sync
+
+# tag_stats 재계산 주기 (분) - 스케줄러에서 사용
+TAG_STATS_REFRESH_MINUTES = int(os.getenv("TAG_STATS_REFRESH_MINUTES", "30"))
+TAG_STATS_VERSION = "tag_stats"
+TAG_STATS_LOCK_KEY = "hashtags:stats:lock"
+# 워커별 자동완성 목록 재로딩 주기 (초) - 버전이 바뀌면 그 전에도 재로딩
+SUGGEST_TTL = int(os.getenv("TAG_SUGGEST_TTL", "3600"))
+VERSION_CHECK_INTERVAL = 10
+# 인기 태그는 미리 정렬해 두는 개수
+POPULAR_SIZE = 100
+
+
+class TagSuggestion(NamedTuple):
+    slug: str
+    name: str
+    count: int
+
+
+# ------------------------------------------
+# tag_stats 재계산 (태그별 장소 수)
+# ------------------------------------------
+def refresh_tag_stats() -> int | None:
+    """
+    tag_stats를 한 트랜잭션에서 비우고 INSERT ... SELECT 로 다시 채움
+    여러 워커의 스케줄러가 동시에 실행하지 않도록 Redis 락 사용
+    """
+    if not redis_sync_client.set(TAG_STATS_LOCK_KEY, "1", nx=True, ex=60 * 10):
+        return None
+
+    db = SessionLocal()
+    try:
+        counts = (
+            select(Tag.id, Tag.slug, Tag.name, func.count(PlaceTag.id))
+            .join(PlaceTag, PlaceTag.tag_id == Tag.id)
+            .group_by(Tag.id, Tag.slug, Tag.name)
+        )
+        db.query(TagStat).delete(synchronize_session=False)
+        db.execute(
+            TagStat.__table__.insert().from_select(["tag_id", "slug", "name", "place_count"], counts)
+        )
+        db.commit()
+        total = db.query(func.count(TagStat.tag_id)).scalar()
+        bump_version_sync(TAG_STATS_VERSION)
+        print(f"🏷️ 태그 통계 갱신: {total}개 태그")
+        return total
+    except Exception as e:
+        db.rollback()
+        print(f"❌ 태그 통계 갱신 실패: {e}")
+        return None
+    finally:
+        db.close()
+        redis_sync_client.delete(TAG_STATS_LOCK_KEY)
+
+
+# ------------------------------------------
+# 자동완성 (워커별 메모리, slug 정렬 목록 + bisect)
+# ------------------------------------------
+class TagSuggester:
+    def __init__(self, stats: list[TagSuggestion], version: int):
+        self.stats = sorted(stats)
+        self.slugs = [s.slug for s in self.stats]
+        self.popular = heapq.nlargest(POPULAR_SIZE, self.stats, key=lambda s: s.count)
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.checked_at = self.loaded_at
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[TagSuggestion]:
+        """
+        접두어가 같은 태그를 장소 수 많은 순으로 (접두어가 없으면 인기 태그)
+        """
+        prefix = normalize_tag(prefix)
+        if not prefix:
+            return self.popular[:limit]
+        start = bisect.bisect_left(self.slugs, prefix)
+        end = bisect.bisect_left(self.slugs, prefix + "\uffff", lo=start)
+        return heapq.nlargest(limit, self.stats[start:end], key=lambda s: s.count)
+
+
+_suggester: TagSuggester | None = None
+_suggester_lock = threading.Lock()
+
+
+def _current_version() -> int:
+    try:
+        return get_version_sync(TAG_STATS_VERSION)
+    except Exception:
+        return -1
+
+
+def _load_suggester(db: Session, version: int) -> TagSuggester:
+    rows = db.query(TagStat.slug, TagStat.name, TagStat.place_count).all()
+    return TagSuggester([TagSuggestion(slug, name, count) for slug, name, count in rows], version)
+
+
+def get_tag_suggester(db: Session) -> TagSuggester:
+    global _suggester
+    suggester = _suggester
+    now = time.monotonic()
+    if suggester is not None and now - suggester.loaded_at < SUGGEST_TTL:
+        if now - suggester.checked_at < VERSION_CHECK_INTERVAL:
+            return suggester
+        suggester.checked_at = now
+        if _current_version() == suggester.version:
+            return suggester
+
+    with _suggester_lock:
+        if _suggester is None or _suggester is suggester:
+            _suggester = _load_suggester(db, _current_version())
+        return _suggester
+
+
+def suggest_tags(db: Session, prefix: str, limit: int = 10) -> list[dict]:
+    return [
+        {"name": s.name, "slug": s.slug, "count": s.count}
+        for s in get_tag_suggester(db).suggest(prefix, limit)
+    ]
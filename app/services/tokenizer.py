@@ -0,0 +1,109 @@
+# app/services/tokenizer.py
+"""
+Okt 형태소 분석기 래퍼
+
+- Okt()는 JVM을 띄우므로 처음 사용할 때 생성 (웹 워커는 해시태그 생성 전까지 JVM 없이 동작)
+- TOKENIZER_MODE=process 이면 별도 프로세스 하나에서만 JVM을 띄우고 배치 단위로 요청
+- 최근 분석 결과는 LRU 캐시
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+
+# local: 현재 프로세스에서 분석 / process: 전용 프로세스에서 분석
+TOKENIZER_MODE = os.getenv("TOKENIZER_MODE", "local")
+TOKENIZER_CACHE_SIZE = int(os.getenv("TOKENIZER_CACHE_SIZE", "2048"))
+
+_okt = None
+_okt_lock = threading.Lock()
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# 최근 분석 결과 (문장 → 명사 목록)
+_cache: OrderedDict[str, list[str]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _get_okt():
+    global _okt
+    if _okt is None:
+        with _okt_lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+
+                _okt = Okt()
+                print("🔤 Okt 형태소 분석기 초기화")
+    return _okt
+
+
+def _nouns_local(texts: list[str]) -> list[list[str]]:
+    okt = _get_okt()
+    return [okt.nouns(text) for text in texts]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # JVM이 있는 프로세스를 fork하지 않도록 spawn
+                _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def use_local_tokenizer():
+    """
+    이미 별도 프로세스인 곳(해시태그 배치 워커 등)에서는 그 프로세스에서 바로 분석
+    """
+    global TOKENIZER_MODE
+    TOKENIZER_MODE = "local"
+
+
+def shutdown_tokenizer():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _cache_get(text: str) -> list[str] | None:
+    with _cache_lock:
+        result = _cache.get(text)
+        if result is not None:
+            _cache.move_to_end(text)
+        return result
+
+
+def _cache_put(text: str, result: list[str]):
+    with _cache_lock:
+        _cache[text] = result
+        _cache.move_to_end(text)
+        while len(_cache) > TOKENIZER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def nouns_batch(texts: list[str]) -> list[list[str]]:
+    """
+    여러 문장을 한 번에 명사 추출
+    캐시에 없는 문장만 모아서 분석 (process 모드에서는 요청 1회)
+    """
+    results: list[list[str] | None] = [_cache_get(text) if text else [] for text in texts]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        pending = [texts[i] for i in missing]
+        if TOKENIZER_MODE == "process":
+            analyzed = _get_executor().submit(_nouns_local, pending).result()
+        else:
+            analyzed = _nouns_local(pending)
+        for i, result in zip(missing, analyzed):
+            _cache_put(texts[i], result)
+            results[i] = result
+    return [list(r) for r in results]
+
+
+def nouns(text: str) -> list[str]:
+    """
+    명사 추출 (최근 결과 캐시)
+    """
+    return nouns_batch([text])[0]
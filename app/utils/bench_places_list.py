@@ -0,0 +1,81 @@
+# app/utils/bench_places_list.py
+"""
+목록 조회 파이프라인 요청당 SQL 실행 횟수 / 소요시간 측정
+
+    python -m app.utils.bench_places_list [user_id]
+
+요청당 SQL 수가 QUERY_BUDGET을 넘는 조건이 있으면 종료 코드 1 (CI에서 회귀 확인용)
+"""
+import sys
+import time
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.places import LIST_QUERY_BUDGET, PlaceListPlan, run_place_list
+from app.utils.query_counter import count_queries
+
+# 측정할 목록 조건 (/, /places/list 대표 케이스)
+BENCH_PLANS = [
+    PlaceListPlan(),
+    PlaceListPlan(page=5, sort="created"),
+    PlaceListPlan(contenttypeid="12", addr="서울"),
+    PlaceListPlan(search="바다", sort="relevance"),
+    PlaceListPlan(tag="축제"),
+]
+REPEAT = 5
+QUERY_BUDGET = LIST_QUERY_BUDGET
+
+
+def _render_cards(places):
+    """
+    템플릿이 카드마다 읽는 관계를 똑같이 접근 (지연 로딩이 남아 있으면 여기서 쿼리가 늘어남)
+    """
+    for place in places:
+        for pt in place.hashtags[:6]:
+            pt.tag.name
+
+
+def _measure(plan: PlaceListPlan, user_id: int | None) -> int:
+    """
+    요청 1회와 같은 조건(새 세션)에서 목록 조회 + 카드 렌더링의 SQL 수
+    """
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id) if user_id else None
+        with count_queries() as statements:
+            result = run_place_list(db, plan, user)
+            _render_cards(result["places"])
+        return len(statements)
+    finally:
+        db.close()
+
+
+def run_bench(user_id: int | None = None) -> bool:
+    print(f"{'plan':<70} {'queries':>7} {'avg ms':>8}")
+    over_budget = []
+    for plan in BENCH_PLANS:
+        # 첫 실행은 워커별 인덱스/캐시 준비가 섞이므로 제외
+        _measure(plan, user_id)
+        query_counts = []
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            query_counts.append(_measure(plan, user_id))
+        elapsed_ms = (time.perf_counter() - started) * 1000 / REPEAT
+        label = (
+            f"page={plan.page} sort={plan.sort} type={plan.contenttypeid} "
+            f"addr={plan.addr} search={plan.search} tag={plan.tag}"
+        )
+        print(f"{label:<70} {max(query_counts):>7} {elapsed_ms:>8.1f}")
+        if max(query_counts) > QUERY_BUDGET:
+            over_budget.append(label)
+
+    if over_budget:
+        print(f"❌ 쿼리 예산({QUERY_BUDGET}) 초과: {len(over_budget)}개 조건")
+        return False
+    print(f"✅ 모든 조건이 쿼리 예산({QUERY_BUDGET}) 이내")
+    return True
+
+
+if __name__ == "__main__":
+    ok = run_bench(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 커넥션 풀 크기 (전체 / 호스트별)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "30"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "10"))
+
+# 호스트별 초당 요청 수 제한 (TourAPI 트래픽 제한 대응)
+HOST_RATE_LIMITS = {
+    "apis.data.go.kr": float(os.getenv("TOUR_API_RATE_LIMIT", "20")),
+}
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+_rate_limiters: dict[str, "RateLimiter"] = {}
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식의 호스트별 요청 속도 제한
+    rate: 초당 허용 요청 수, burst: 순간 최대 요청 수
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _get_rate_limiter(url: str) -> RateLimiter | None:
+    host = urlsplit(url).hostname or ""
+    rate = HOST_RATE_LIMITS.get(host)
+    if not rate:
+        return None
+    limiter = _rate_limiters.get(host)
+    if limiter is None:
+        limiter = RateLimiter(rate)
+        _rate_limiters[host] = limiter
+    return limiter
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    프로세스 공용 aiohttp 세션 (커넥션 풀 재사용)
+    이벤트 루프가 바뀌면(스크립트 asyncio.run 등) 새로 생성
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_DEFAULT_TIMEOUT),
+        )
+        _session_loop = loop
+        _rate_limiters.clear()
+    return _session
+
+
+async def close_http_session():
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+async def fetch_json(
+    url: str,
+    params: dict,
+    retries: int = 3,
+    backoff: float = 0.5,
+    timeout: float | None = None,
+) -> dict:
+    """
+    GET 요청 후 JSON 반환
+    - 호스트별 속도 제한 적용
+    - 네트워크 오류 / 429 / 5xx 는 지수 백오프(+jitter)로 재시도
+    """
+    session = await get_http_session()
+    limiter = _get_rate_limiter(url)
+    # timeout=None 을 넘기면 세션 기본값(HTTP_DEFAULT_TIMEOUT)까지 무시되므로 지정했을 때만 전달
+    request_kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+
+    for attempt in range(retries + 1):
+        if limiter:
+            await limiter.acquire()
+        try:
+            async with session.get(url, params=params, **request_kwargs) as res:
+                if res.status in RETRY_STATUS:
+                    raise aiohttp.ClientResponseError(
+                        res.request_info, res.history, status=res.status, message=res.reason or ""
+                    )
+                res.raise_for_status()
+                return await res.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if isinstance(e, aiohttp.ClientResponseError) and e.status not in RETRY_STATUS:
+                raise
+            if attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+            print(f"⚠️ {url} 요청 실패({e}) → {delay:.1f}초 후 재시도 ({attempt + 1}/{retries})")
+            await asyncio.sleep(delay)
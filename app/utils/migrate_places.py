@@ -0,0 +1,120 @@
+# app/utils/migrate_places.py
+"""
+기존 DB에 places 관련 인덱스/컬럼 추가
+(create_all은 이미 있는 테이블을 변경하지 않으므로 배포 후 1회 실행)
+
+    python -m app.utils.migrate_places
+"""
+from sqlalchemy import text
+from app.database import engine
+
+# (인덱스/컬럼 이름, 존재 확인 SQL, 적용 SQL)
+MIGRATIONS = [
+    (
+        "ix_places_mapy_mapx",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ix_places_mapy_mapx'",
+        "CREATE INDEX ix_places_mapy_mapx ON places (mapy, mapx)",
+    ),
+    (
+        "ft_places_title_overview",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ft_places_title_overview'",
+        "CREATE FULLTEXT INDEX ft_places_title_overview ON places (title, overview) WITH PARSER ngram",
+    ),
+    (
+        "ft_places_title",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ft_places_title'",
+        "CREATE FULLTEXT INDEX ft_places_title ON places (title) WITH PARSER ngram",
+    ),
+    (
+        "places.has_image",
+        "SELECT COUNT(*) FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND column_name = 'has_image'",
+        "ALTER TABLE places ADD COLUMN has_image BOOLEAN NOT NULL DEFAULT 0, "
+        "ALGORITHM=INSTANT",
+    ),
+    (
+        "places.tag_fingerprint",
+        "SELECT COUNT(*) FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND column_name = 'tag_fingerprint'",
+        "ALTER TABLE places ADD COLUMN tag_fingerprint VARCHAR(40) NULL, ALGORITHM=INSTANT",
+    ),
+    (
+        "places.has_image 채우기",
+        "SELECT COUNT(*) = 0 FROM places WHERE has_image = 0 AND firstimage IS NOT NULL AND firstimage != ''",
+        "UPDATE places SET has_image = (firstimage IS NOT NULL AND firstimage != '')",
+    ),
+    (
+        "ix_places_list_updated",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ix_places_list_updated'",
+        "CREATE INDEX ix_places_list_updated ON places (has_image, updated_at, id)",
+    ),
+    (
+        "ix_places_list_created",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ix_places_list_created'",
+        "CREATE INDEX ix_places_list_created ON places (has_image DESC, created_at, id)",
+    ),
+    (
+        "ix_places_list_created (has_image DESC)",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ix_places_list_created' "
+        "AND column_name = 'has_image' AND collation = 'D'",
+        "ALTER TABLE places DROP INDEX ix_places_list_created, "
+        "ADD INDEX ix_places_list_created (has_image DESC, created_at, id)",
+    ),
+    (
+        "ix_places_list_id",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ix_places_list_id'",
+        "CREATE INDEX ix_places_list_id ON places (has_image, id)",
+    ),
+    (
+        "places.synced_at",
+        "SELECT COUNT(*) FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND column_name = 'synced_at'",
+        "ALTER TABLE places ADD COLUMN synced_at DATETIME NULL, ALGORITHM=INSTANT",
+    ),
+    (
+        "places.synced_at 채우기",
+        "SELECT COUNT(*) = 0 FROM places WHERE synced_at IS NULL",
+        # 기존 행은 마지막 변경 시각을 알 수 없으므로 마이그레이션 시각(UTC)으로 - 다음 내보내기에서 한 번 전체 전송
+        "UPDATE places SET synced_at = UTC_TIMESTAMP() WHERE synced_at IS NULL",
+    ),
+    (
+        "ix_places_synced_at",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'places' AND index_name = 'ix_places_synced_at'",
+        "CREATE INDEX ix_places_synced_at ON places (synced_at)",
+    ),
+    (
+        "place_details 중복 행 정리",
+        "SELECT COUNT(*) = 0 FROM (SELECT place_id FROM place_details GROUP BY place_id HAVING COUNT(*) > 1) AS dup",
+        # 장소별로 가장 최근(id가 큰) 행만 남김
+        "DELETE d1 FROM place_details d1 "
+        "JOIN place_details d2 ON d1.place_id = d2.place_id AND d1.id < d2.id",
+    ),
+    (
+        "uq_place_details_place_id",
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'place_details' AND index_name = 'uq_place_details_place_id'",
+        "CREATE UNIQUE INDEX uq_place_details_place_id ON place_details (place_id)",
+    ),
+]
+
+
+def run_migrations():
+    with engine.begin() as conn:
+        for name, check_sql, apply_sql in MIGRATIONS:
+            if conn.execute(text(check_sql)).scalar():
+                print(f"✔ {name} 이미 적용됨")
+                continue
+            conn.execute(text(apply_sql))
+            print(f"✅ {name} 적용 완료")
+
+
+if __name__ == "__main__":
+    run_migrations()
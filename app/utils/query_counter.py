@@ -0,0 +1,34 @@
+# app/utils/query_counter.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 현재 컨텍스트(요청/스크립트)에서 실행된 SQL 목록, 측정 중이 아니면 None
+_statements: ContextVar[list[str] | None] = ContextVar("query_counter_statements", default=None)
+
+
+# 모든 엔진 (운영 DB / 테스트 DB)
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    with 블록 안에서 실행된 SQL 문 목록 수집
+
+        with count_queries() as statements:
+            ...
+        print(len(statements))
+    """
+    statements: list[str] = []
+    token = _statements.set(statements)
+    try:
+        yield statements
+    finally:
+        _statements.reset(token)
@@ -1,4 +1,5 @@
 import redis.asyncio as redis
+import redis as redis_sync
 import json
 import os
 from dotenv import load_dotenv
@@ -27,3 +28,27 @@ async def get_cached(key: str):
 
 async def delete_cached(key: str):
     await redis_client.delete(key)
+
+# 캐시 무효화용 버전 카운터 (키에 버전을 포함시키고, 데이터 변경 시 증가)
+async def get_version(name: str) -> int:
+    value = await redis_client.get(f"version:{name}")
+    return int(value or 0)
+
+async def bump_version(name: str) -> int:
+    return await redis_client.incr(f"version:{name}")
+
+
+# 동기 코드(threadpool에서 도는 DB 조회 등)용 클라이언트
+redis_sync_client = redis_sync.from_url(
+    f"redis://{REDIS_HOST}:{REDIS_PORT}",
+    db=REDIS_DB,
+    encoding="utf-8",
+    decode_responses=True,
+)
+
+def get_version_sync(name: str) -> int:
+    value = redis_sync_client.get(f"version:{name}")
+    return int(value or 0)
+
+def bump_version_sync(name: str) -> int:
+    return redis_sync_client.incr(f"version:{name}")
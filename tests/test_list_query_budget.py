@@ -0,0 +1,210 @@
+# tests/test_list_query_budget.py
+"""
+목록 조회 요청당 SQL 수가 LIST_QUERY_BUDGET 이내인지 확인
+
+    python -m pytest -q tests/test_list_query_budget.py
+
+기본은 SQLite 메모리 DB, TEST_DATABASE_URL(MySQL)을 주면 그 DB에서 실행 (검색 조건은 FULLTEXT라 MySQL에서만)
+워커별 태그 인덱스 / 특징 행렬은 요청마다 만들지 않으므로 측정 전에 직접 준비
+"""
+import os
+from datetime import datetime, timedelta
+
+# app.database / redis_client가 import 시점에 읽는 설정 (Redis가 없으면 각 캐시는 DB로 대체)
+for name, value in {
+    "MYSQL_USER": "test", "MYSQL_PASSWORD": "test", "MYSQL_HOST": "localhost", "DB_PORT": "3306",
+    "MYSQL_DATABASE": "test", "REDIS_HOST": "localhost",
+}.items():
+    os.environ.setdefault(name, value)
+
+import importlib
+import pkgutil
+
+import pytest
+from sqlalchemy import BigInteger, create_engine, event, null
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models
+from app.database import Base
+from app.models.hashtag import PlaceTag, Tag
+from app.models.places import Place, PlaceFeature
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.services import place_features, tag_index
+from app.services.places import LIST_QUERY_BUDGET, PLACES_PER_PAGE, PlaceListPlan, run_place_list
+from app.utils.query_counter import count_queries
+
+# relationship 문자열 참조가 풀리도록 모든 모델 등록
+for module in pkgutil.iter_modules(app.models.__path__):
+    importlib.import_module(f"app.models.{module.name}")
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite://")
+IS_SQLITE = TEST_DATABASE_URL.startswith("sqlite")
+PLACE_COUNT = PLACES_PER_PAGE * 3
+BASE_TIME = datetime(2024, 1, 1)
+
+
+# SQLite는 INTEGER PRIMARY KEY만 자동 증가
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    return "INTEGER"
+
+
+def _substring_index(value, delimiter, count):
+    if value is None:
+        return None
+    return delimiter.join(value.split(delimiter)[:count])
+
+
+@pytest.fixture(scope="module")
+def engine():
+    if IS_SQLITE:
+        engine = create_engine(
+            TEST_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+
+        # 목록 카드 개요 요약에 쓰는 MySQL 함수
+        @event.listens_for(engine, "connect")
+        def _register_functions(dbapi_conn, _):
+            dbapi_conn.create_function("substring_index", 3, _substring_index)
+    else:
+        engine = create_engine(TEST_DATABASE_URL)
+
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded(engine):
+    factory = sessionmaker(bind=engine, autoflush=False)
+    db = factory()
+    try:
+        tags = [Tag(name=name, slug=name) for name in ("축제", "바다", "맛집")]
+        db.add_all(tags)
+        user = User(email="budget@example.com")
+        db.add(user)
+        db.flush()
+        db.add(UserProfile(user_id=user.id, preferences={"companion": "가족", "area_theme": ["바다"]}))
+
+        for i in range(PLACE_COUNT):
+            place = Place(
+                contentid=f"budget-{i}",
+                contenttypeid=12 if i % 2 else 15,
+                title=f"바다 축제 {i}",
+                addr1="서울 중구" if i % 3 else "부산 해운대구",
+                overview="바다가 보이는 축제. 두 번째 문장.",
+                firstimage=f"https://example.com/{i}.jpg" if i % 4 else None,
+                has_image=bool(i % 4),
+                # 같은 시각 / NULL도 섞어 keyset 경계 확인
+                created_at=BASE_TIME + timedelta(hours=i // 3) if i % 7 else null(),
+                updated_at=BASE_TIME + timedelta(hours=(PLACE_COUNT - i) // 2) if i % 5 else null(),
+            )
+            db.add(place)
+            db.flush()
+            db.add_all(PlaceTag(place_id=place.id, tag_id=tag.id) for tag in tags[: i % 3 + 1])
+            db.add(PlaceFeature(
+                place_id=place.id, contentid=place.contentid, contenttypeid=place.contenttypeid,
+                region=place.addr1[:2],
+            ))
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+
+    # 워커 시작 후 한 번만 만드는 인덱스 / 행렬은 미리 준비 (요청 예산에는 포함하지 않음)
+    db = factory()
+    try:
+        tag_index.invalidate_tag_index()
+        place_features.invalidate_feature_matrix()
+        tag_index.get_tag_index(db)
+        place_features.get_feature_matrix(db)
+    finally:
+        db.close()
+
+    return factory, user_id
+
+
+def _count_list_queries(seeded, plan: PlaceListPlan, logged_in: bool) -> tuple[int, dict]:
+    """
+    요청 1회와 같은 조건(새 세션)에서 목록 조회 + 카드 해시태그 접근의 SQL 수
+    """
+    factory, user_id = seeded
+    db = factory()
+    try:
+        user = db.get(User, user_id) if logged_in else None
+        with count_queries() as statements:
+            result = run_place_list(db, plan, user)
+            for place in result["places"]:
+                for pt in place.hashtags[:6]:
+                    pt.tag.name
+        return len(statements), result
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("logged_in", [False, True], ids=["anonymous", "logged_in"])
+@pytest.mark.parametrize("plan", [
+    PlaceListPlan(),
+    PlaceListPlan(page=2, sort="created"),
+    PlaceListPlan(contenttypeid="12", addr="서울"),
+    PlaceListPlan(tag="축제"),
+    PlaceListPlan(tag="바다,맛집", sort="id"),
+], ids=["default", "created_page2", "type_addr", "tag", "tags_id"])
+def test_list_query_budget(seeded, plan, logged_in):
+    count, result = _count_list_queries(seeded, plan, logged_in)
+    assert result["places"]
+    assert count <= LIST_QUERY_BUDGET, f"{count} queries for {plan}"
+
+
+@pytest.mark.parametrize("logged_in", [False, True], ids=["anonymous", "logged_in"])
+def test_cursor_page_query_budget(seeded, logged_in):
+    _, first = _count_list_queries(seeded, PlaceListPlan(), logged_in)
+    assert first["next_cursor"]
+    count, result = _count_list_queries(
+        seeded, PlaceListPlan(page=2, cursor=first["next_cursor"]), logged_in,
+    )
+    assert result["places"]
+    assert count <= LIST_QUERY_BUDGET
+
+
+@pytest.mark.skipif(IS_SQLITE, reason="FULLTEXT 검색은 MySQL(TEST_DATABASE_URL)에서만")
+@pytest.mark.parametrize("logged_in", [False, True], ids=["anonymous", "logged_in"])
+def test_search_query_budget(seeded, logged_in):
+    count, _ = _count_list_queries(
+        seeded, PlaceListPlan(search="바다", sort="relevance"), logged_in,
+    )
+    assert count <= LIST_QUERY_BUDGET
+
+
+@pytest.mark.parametrize("sort", ["updated", "created", "id"])
+def test_cursor_pages_match_offset_pages(seeded, sort):
+    factory, _ = seeded
+    db = factory()
+    try:
+        pages = (PLACE_COUNT + PLACES_PER_PAGE - 1) // PLACES_PER_PAGE
+        offset_pages = [
+            [p.id for p in run_place_list(db, PlaceListPlan(page=page, sort=sort))["places"]]
+            for page in range(1, pages + 1)
+        ]
+
+        result = run_place_list(db, PlaceListPlan(sort=sort))
+        assert result["prev_cursor"] is None
+        forward = [[p.id for p in result["places"]]]
+        while result["next_cursor"] and len(forward) <= pages:
+            result = run_place_list(db, PlaceListPlan(sort=sort, cursor=result["next_cursor"]))
+            forward.append([p.id for p in result["places"]])
+        assert forward == offset_pages
+
+        backward = [forward[-1]]
+        while result["prev_cursor"] and len(backward) <= pages:
+            result = run_place_list(db, PlaceListPlan(sort=sort, cursor=result["prev_cursor"]))
+            backward.append([p.id for p in result["places"]])
+        assert backward[::-1] == offset_pages
+    finally:
+        db.close()